@@ -0,0 +1,127 @@
+import math
+import logging
+
+import numpy as np
+
+from SortEngines import ENGINES, argsort, key_array, sort_array, sort_with
+from TimSort import fix_up_sort
+
+logger = logging.getLogger(__name__)
+
+SMALL_INPUT = 64  # Inputs up to this size go straight to introsort
+SMALL_RANGE = 1 << 16  # Integer ranges up to this are counted instead of radix sorted
+MANY_DUPLICATES = 0.5  # Duplicate ratio above which a sample is not tested for uniformity
+HISTOGRAM_BINS = 8  # Bins used to test a float sample for uniformity
+NEARLY_SORTED = 0.05  # Largest fraction of descents in a nearly sorted sample
+
+
+def sample_features(arr):
+    """
+    Measures an input from a sample of about sqrt(n) evenly spaced elements.
+    The spacing keeps the sample in input order, so descents in the sample
+    reflect how presorted the whole input is.
+
+    Returns:
+        A dict with n, the element kind ('int', 'float' or 'other'), and for
+        the sample its size, value range, duplicate ratio and the fraction of
+        adjacent pairs that are out of order.
+    """
+    n = len(arr)
+    step = max(1, int(math.isqrt(n)))
+    sample = [arr[i] for i in range(0, n, step)]
+
+    values = np.asarray(sample)
+    if values.dtype.kind in 'iu':
+        kind = 'int'
+    elif values.dtype.kind == 'f':
+        kind = 'float'
+    else:
+        kind = 'other'
+
+    features = {
+        'n': n,
+        'kind': kind,
+        'sample_size': len(sample),
+        'descents': sum(1 for a, b in zip(sample, sample[1:]) if b < a) / max(1, len(sample) - 1),
+    }
+    if kind != 'other' and len(values):
+        features['range'] = values.max().item() - values.min().item()
+        features['duplicates'] = 1 - len(np.unique(values)) / len(values)
+    return features
+
+
+def _looks_uniform(arr, features):
+    """
+    True if an evenly spaced sample of a float input fills equal-width bins
+    evenly, i.e. no bin gets more than twice its share. A sample holding
+    inf or NaN is never uniform.
+    """
+    step = max(1, int(math.isqrt(len(arr))))
+    sample = np.asarray(arr[::step])
+    if not np.isfinite(sample).all():
+        return False
+    counts, _ = np.histogram(sample, bins=HISTOGRAM_BINS)
+    return counts.max() <= 2 * features['sample_size'] / HISTOGRAM_BINS
+
+
+def choose_algorithm(arr):
+    """
+    Picks the engine for arr from a cheap sample.
+
+    Returns:
+        The engine name (a key of ENGINES), the reason for the choice, and
+        the sampled features.
+    """
+    features = sample_features(arr)
+
+    if features['n'] <= SMALL_INPUT:
+        return 'introsort', 'small input', features
+    if features['descents'] <= NEARLY_SORTED:
+        # list.sort finds the runs in C; ndarrays get fix_up_sort instead
+        return 'timsort', 'nearly sorted', features
+    if features['kind'] == 'int':
+        if features['range'] <= SMALL_RANGE or features['duplicates'] > MANY_DUPLICATES:
+            return 'counting_sort', 'small integer range', features
+        return 'radix_sort', 'fixed-width integers', features
+    if features['kind'] == 'float':
+        if features['duplicates'] > MANY_DUPLICATES:
+            return 'radix_sort', 'floats with many duplicates', features
+        if _looks_uniform(arr, features):
+            return 'bucket_sort', 'uniform floats', features
+        return 'radix_sort', 'non-uniform floats', features
+    return 'introsort', 'no exploitable structure', features
+
+
+def sort(arr, key=None, reverse=False):
+    """
+    Sorts the given array with whichever engine suits it best, judged from
+    a sample of O(sqrt(n)) elements. The decision is logged at INFO level.
+
+    With a key or reverse, the keys are computed once and the engine is
+    chosen for them, so numeric keys of any items go to the radix or
+    counting engines. The sort is stable, reverse included.
+
+    Returns:
+        A new sorted list, or a NumPy array if arr is one.
+    """
+    if key is not None or reverse:
+        keys = key_array(arr, key)
+        name, reason, features = choose_algorithm(keys)
+        logger.info('sort: %s chosen for %s keys (%s)', name, reason, features)
+        order = argsort(name, keys, reverse)
+        if isinstance(arr, np.ndarray):
+            return arr[order]
+        return [arr[i] for i in order.tolist()]
+
+    name, reason, features = choose_algorithm(arr)
+    logger.info('sort: %s chosen for %s (%s)', name, reason, features)
+
+    if isinstance(arr, np.ndarray) and name == 'timsort':
+        result = arr.copy()
+        fix_up_sort(result)
+        return result
+    if isinstance(arr, np.ndarray):
+        return sort_array(name, arr)
+    if ENGINES[name].in_place:
+        return sort_with(name, list(arr))
+    return sort_with(name, arr)
@@ -0,0 +1,105 @@
+import numpy as np
+
+from Radixsort import ordered_keys
+
+
+def index_dtype(n):
+    """
+    The compact index type for a permutation of n elements.
+    """
+    return np.int32 if n < 2 ** 31 else np.int64
+
+
+class _Indexed:
+    """
+    A key tagged with its position. Ordering by (key, position) makes every
+    element distinct, so any sort of these is stable.
+    """
+    __slots__ = ('key', 'index')
+
+    def __init__(self, key, index):
+        self.key = key
+        self.index = index
+
+    def __lt__(self, other):
+        if self.key < other.key:
+            return True
+        if other.key < self.key:
+            return False
+        return self.index < other.index
+
+    def __gt__(self, other):
+        return other.__lt__(self)
+
+    def __le__(self, other):
+        return not other.__lt__(self)
+
+    def __ge__(self, other):
+        return not self.__lt__(other)
+
+    def __eq__(self, other):
+        return self.index == other.index
+
+    def __hash__(self):
+        return self.index
+
+
+def _composite_keys(keys):
+    """
+    Encodes numeric key k at position i as the single int (k - lo) * n + i,
+    which orders like (k, i). Floats are first mapped to their order
+    preserving unsigned bits, so -0.0 goes before +0.0 and NaNs last.
+
+    Returns:
+        The list of composite ints, or None if keys are not numbers.
+    """
+    values = np.asarray(keys)
+    if values.dtype.kind == 'f' and values.dtype.itemsize <= 8:
+        values = ordered_keys(values)
+
+    if values.dtype.kind in 'iu':
+        ints = values.tolist()
+    elif values.dtype == object and all(type(k) is int for k in keys):
+        ints = list(keys)
+    else:
+        return None
+
+    n = len(ints)
+    lo = min(ints)
+    return [(k - lo) * n + i for i, k in enumerate(ints)]
+
+
+def argsort_by(sort_fn, keys, in_place=True):
+    """
+    Stable argsort of keys with any sort function.
+
+    Numeric keys are packed together with their positions into single ints,
+    so the sort only moves and compares plain ints. Other keys are wrapped
+    with their position and compared as (key, position).
+
+    Args:
+        sort_fn: A sort function taking a list.
+        keys: The sort keys, a list or NumPy array.
+        in_place: Whether sort_fn sorts its argument, as opposed to
+            returning a new sorted list.
+
+    Returns:
+        A compact index array; keys taken in that order are sorted, and
+        np.take(column, perm) applies it to any other column.
+    """
+    n = len(keys)
+    if n == 0:
+        return np.empty(0, dtype=index_dtype(0))
+
+    composite = _composite_keys(keys)
+    if composite is not None:
+        items, position = composite, lambda c: c % n
+    else:
+        items = [_Indexed(key, i) for i, key in enumerate(keys)]
+        position = lambda item: item.index
+
+    if in_place:
+        sort_fn(items)
+    else:
+        items = sort_fn(items)
+    return np.fromiter(map(position, items), dtype=index_dtype(n), count=n)
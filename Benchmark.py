@@ -0,0 +1,370 @@
+import os
+import csv
+import math
+import json
+import argparse
+import functools
+import importlib.util
+import statistics
+import time
+
+import numpy as np
+
+from Datasets import DISTRIBUTIONS, load
+from Heapsort import HEAP_VARIANTS, heap_sort
+from Instrumentation import count_operations, measure_memory
+from Radixsort import american_flag_sort
+from ResultStore import STORE_PATH, save_run
+from SortEngines import ENGINES, sort_with
+
+REPEATS = 5  # Timed runs per cell
+WARMUPS = 1  # Untimed runs per cell before the timed ones
+SIZES = (100, 1000, 10000)  # Default input sizes
+NUMERIC_ONLY = ('radix_sort', 'counting_sort')  # Engines that cannot sort strings
+TREE_DISTRIBUTION = 'tree_insert'  # Distribution name of the tree operation records
+
+# Tree insertions timed by --trees: script and tree type passed to its
+# insertNodes. Treap&Red-black's RBT is left out, its fixViolation fails on
+# the script's own nodes
+TREE_OPERATIONS = (
+    ('Skip&AVL.py', 'AVL'),
+    ('Skip&AVL.py', 'SkipList'),
+    ('Skip&Red-black.py', 'RB'),
+    ('Skip&Red-black.py', 'SkipList'),
+    ('Treap&Red-black.py', 'Treap'),
+    ('treap&AVL.py', 'AVL'),
+    ('treap&AVL.py', 'Treap'),
+)
+
+
+def discover_algorithms():
+    """
+    Every sort engine of SortEngines, the heap sort variants other than the
+    classic one, and American flag sort for strings.
+
+    Returns:
+        A dict from algorithm name to a function that sorts a list and
+        returns the sorted data.
+    """
+    algorithms = {name: functools.partial(sort_with, name) for name in ENGINES}
+    for variant in HEAP_VARIANTS:
+        if variant != 'classic':
+            algorithms['heap_sort:' + variant] = functools.partial(_in_place, heap_sort, variant=variant)
+    algorithms['american_flag_sort'] = functools.partial(_in_place, american_flag_sort)
+    return algorithms
+
+
+def _in_place(sort_fn, data, **kwargs):
+    """
+    Runs an in-place sort and returns the data it sorted.
+    """
+    sort_fn(data, **kwargs)
+    return data
+
+
+def supports(algorithm, distribution):
+    """
+    True if the algorithm can sort inputs from the distribution.
+    """
+    if DISTRIBUTIONS[distribution].kind == 'str':
+        return algorithm not in NUMERIC_ONLY
+    return algorithm != 'american_flag_sort'
+
+
+def compares_elements(algorithm, distribution):
+    """
+    True if the algorithm sorts inputs from the distribution through element
+    comparisons, so it can be given comparison counting proxies. American
+    flag sort, and the engines that take NumPy arrays when given numbers,
+    need the raw values.
+    """
+    if algorithm == 'american_flag_sort':
+        return False
+    if algorithm in ENGINES and DISTRIBUTIONS[distribution].kind != 'str':
+        return not ENGINES[algorithm].ndarray
+    return True
+
+
+def takes_array(algorithm, distribution):
+    """
+    True if the algorithm is timed on a NumPy array instead of a list: the
+    engines with an ndarray fast path, on numeric inputs.
+    """
+    return algorithm in ENGINES and ENGINES[algorithm].ndarray and DISTRIBUTIONS[distribution].kind != 'str'
+
+
+def _fresh(data):
+    """
+    A copy of data for one run: a plain NumPy array for arrays, memory maps
+    included, and a list otherwise.
+    """
+    return np.array(data) if isinstance(data, np.ndarray) else list(data)
+
+
+def percentile(values, q):
+    """
+    The q-th percentile of values by the nearest-rank method.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def time_cell(sort_fn, data, repeats=REPEATS, warmups=WARMUPS):
+    """
+    Times sort_fn on data. Every run, warm-up or timed, gets its own fresh
+    copy, a list or a NumPy array like data, so in-place sorts never see
+    data sorted by an earlier run.
+
+    Returns:
+        The timed runs in nanoseconds.
+    """
+    for _ in range(warmups):
+        sort_fn(_fresh(data))
+
+    times = []
+    for _ in range(repeats):
+        copy = _fresh(data)
+        start = time.perf_counter_ns()
+        sort_fn(copy)
+        times.append(time.perf_counter_ns() - start)
+    return times
+
+
+def _record(algorithm, distribution, n, times, repeats, warmups):
+    """
+    Result record of one cell.
+    """
+    return {
+        'algorithm': algorithm,
+        'distribution': distribution,
+        'n': n,
+        'repeats': repeats,
+        'warmups': warmups,
+        'min_ns': min(times),
+        'median_ns': statistics.median(times),
+        'p95_ns': percentile(times, 95),
+        'times_ns': times,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _load_script(script):
+    """
+    Imports one of the tree scripts, whose file names are not valid module
+    names. Their plots only run when they are executed directly.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), script)
+    name = 'tree_' + os.path.splitext(script)[0].replace('&', '_').replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_tree_benchmark(repeats=REPEATS, warmups=WARMUPS, log=None):
+    """
+    Times the insertion of each tree script's own nodes list into each of
+    its trees through its insertNodes.
+
+    Returns:
+        A list of result records named script:tree type, in the
+        TREE_DISTRIBUTION distribution.
+    """
+    records = []
+    for script, tree_type in TREE_OPERATIONS:
+        module = _load_script(script)
+        insert = functools.partial(module.insertNodes, tree_type)
+
+        times = time_cell(insert, module.nodes, repeats, warmups)
+        name = '%s:%s' % (os.path.splitext(script)[0], tree_type)
+        record = _record(name, TREE_DISTRIBUTION, len(module.nodes), times, repeats, warmups)
+        records.append(record)
+        if log:
+            log(record)
+    return records
+
+
+def run_benchmark(algorithms, distributions, sizes, repeats=REPEATS, warmups=WARMUPS, seed=0, check=False,
+                  count=False, memory=False, log=None):
+    """
+    Times every algorithm on every distribution and size. Each
+    (distribution, n) input comes from Datasets.load, so large ones are
+    read from the cache, and is shared by all algorithms. Engines with an
+    ndarray fast path sort copies of the array itself, see takes_array;
+    the others a list, built once per input and only if one needs it.
+
+    Args:
+        algorithms: Dict from name to sort function, see discover_algorithms.
+        distributions: Names of DISTRIBUTIONS to run.
+        sizes: Input sizes.
+        repeats: Timed runs per cell.
+        warmups: Untimed runs per cell.
+        seed: Seed of the input generators.
+        check: Verify every algorithm's output against sorted().
+        count: Add operation counts from one extra instrumented run, see
+            Instrumentation.count_operations. The timed runs are never
+            instrumented.
+        memory: Add peak memory and the memory still allocated afterwards
+            from one extra run under tracemalloc, see
+            Instrumentation.measure_memory. Allocations are not counted.
+        log: Called with every finished record, e.g. to print progress.
+
+    Returns:
+        A list of result records, one dict per cell.
+    """
+    records = []
+    for distribution in distributions:
+        for n in sizes:
+            array = load(distribution, n, seed)
+            # tolist() costs about as much as generating the data, so the
+            # list is only built if an algorithm or the counting needs it
+            lists = [name for name in algorithms if supports(name, distribution) and not takes_array(name, distribution)]
+            items = array.tolist() if lists or count else None
+            expected = np.sort(array) if check else None
+
+            for name, sort_fn in algorithms.items():
+                if not supports(name, distribution):
+                    continue
+                if takes_array(name, distribution):
+                    data = array
+                else:
+                    data = items
+                if check and not np.array_equal(np.asarray(sort_fn(_fresh(data))), expected):
+                    raise AssertionError("%s did not sort %s at n=%d" % (name, distribution, n))
+
+                times = time_cell(sort_fn, data, repeats, warmups)
+                record = _record(name, distribution, n, times, repeats, warmups)
+                if count:
+                    # Operations are counted on a list, whose moves can be tracked
+                    record.update(count_operations(sort_fn, items, compares_elements(name, distribution)))
+                if memory:
+                    record.update(measure_memory(sort_fn, data))
+                records.append(record)
+                if log:
+                    log(record)
+    return records
+
+
+CSV_FIELDS = ('algorithm', 'distribution', 'n', 'repeats', 'warmups', 'min_ns', 'median_ns', 'p95_ns',
+              'comparisons', 'moves', 'allocations', 'allocated_elements', 'max_depth',
+              'peak_bytes', 'bytes_per_element', 'retained_bytes', 'retained_blocks')
+
+
+def write_json(records, path):
+    """
+    Writes the result records to path as a JSON list.
+    """
+    with open(path, 'w') as f:
+        json.dump(records, f, indent=1)
+
+
+def write_csv(records, path):
+    """
+    Writes the result records to path as CSV, one row per cell without the
+    individual run times and call counts.
+    """
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def plot_results(records, path=None):
+    """
+    One subplot per distribution of median time against n, one line per
+    algorithm. Shown on screen unless a path to save the figure is given.
+    """
+    import matplotlib.pyplot as plt
+
+    distributions = list(dict.fromkeys(r['distribution'] for r in records))
+    fig, axes = plt.subplots(len(distributions), 1, figsize=(10, 4 * len(distributions)), squeeze=False)
+    for ax, distribution in zip(axes[:, 0], distributions):
+        cells = [r for r in records if r['distribution'] == distribution]
+        for name in dict.fromkeys(r['algorithm'] for r in cells):
+            points = sorted((r['n'], r['median_ns'] / 1e9) for r in cells if r['algorithm'] == name)
+            ax.plot(*zip(*points), marker='o', label=name)
+        ax.set_title(DISTRIBUTIONS[distribution].label if distribution in DISTRIBUTIONS else distribution)
+        ax.set_xlabel('Data size (n)')
+        ax.set_ylabel('Median execution time (s)')
+        ax.grid(True)
+        ax.legend()
+    fig.tight_layout()
+    if path:
+        fig.savefig(path)
+    else:
+        plt.show()
+
+
+def _names(value):
+    """
+    Splits a comma separated command line value.
+    """
+    return [name for name in value.split(',') if name]
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Returns:
+        The result records.
+    """
+    algorithms = discover_algorithms()
+
+    parser = argparse.ArgumentParser(description='Benchmark the sort engines.')
+    parser.add_argument('--algorithms', type=_names, default=list(algorithms),
+                        help='comma separated, default all of: %s' % ','.join(algorithms))
+    parser.add_argument('--distributions', type=_names, default=list(DISTRIBUTIONS),
+                        help='comma separated, default all of: %s' % ','.join(DISTRIBUTIONS))
+    parser.add_argument('--sizes', type=lambda v: [int(float(n)) for n in _names(v)], default=list(SIZES),
+                        help='comma separated input sizes, e.g. 1e3,1e4')
+    parser.add_argument('--repeats', type=int, default=REPEATS, help='timed runs per cell')
+    parser.add_argument('--warmups', type=int, default=WARMUPS, help='untimed runs per cell')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the input generators')
+    parser.add_argument('--check', action='store_true', help="verify every algorithm's output")
+    parser.add_argument('--count', action='store_true',
+                        help='count comparisons, moves, allocations and recursion depth')
+    parser.add_argument('--memory', action='store_true',
+                        help='record peak traced memory and the memory retained after the sort')
+    parser.add_argument('--trees', action='store_true', help='also time the tree scripts\' insertions')
+    parser.add_argument('--store', nargs='?', const=STORE_PATH, default=None,
+                        help='append the run to this result store, default %s' % STORE_PATH)
+    parser.add_argument('--name', help='name of the run in the result store, e.g. baseline')
+    parser.add_argument('--json', help='write the results to this JSON file')
+    parser.add_argument('--csv', help='write the results to this CSV file')
+    parser.add_argument('--plot', nargs='?', const='', default=None,
+                        help='plot the results, to a file if a path is given')
+    args = parser.parse_args(argv)
+
+    for name in args.algorithms:
+        if name not in algorithms:
+            parser.error('unknown algorithm %r' % name)
+    for name in args.distributions:
+        if name not in DISTRIBUTIONS:
+            parser.error('unknown distribution %r' % name)
+
+    def log(record):
+        print('%-22s %-16s n=%-9d min=%10.3fms median=%10.3fms p95=%10.3fms' % (
+            record['algorithm'], record['distribution'], record['n'],
+            record['min_ns'] / 1e6, record['median_ns'] / 1e6, record['p95_ns'] / 1e6))
+
+    records = run_benchmark({name: algorithms[name] for name in args.algorithms}, args.distributions,
+                            args.sizes, args.repeats, args.warmups, args.seed, args.check, args.count,
+                            args.memory, log)
+    if args.trees:
+        records += run_tree_benchmark(args.repeats, args.warmups, log)
+
+    if args.store:
+        save_run(records, args.name, args.store)
+
+    if args.json:
+        write_json(records, args.json)
+    if args.csv:
+        write_csv(records, args.csv)
+    if args.plot is not None:
+        plot_results(records, args.plot or None)
+    return records
+
+
+if __name__ == "__main__":
+    main()
@@ -1,102 +1,113 @@
-import random
-import time
-import matplotlib.pyplot as plt
-import math
+import numpy as np
 
-def bucket_sort(arr):
-    """
-    Sorts the given array using the Bucket Sort algorithm.
-    """
-    # Check if the array is empty or has only one element
-    if len(arr) <= 1:
-        return arr
-
-    # Create empty buckets
-    n = len(arr)
-    buckets = [[] for _ in range(n)]
+from Radixsort import exact_as_floats
 
-    # Normalize input array
-    max_val = max(arr)
-    if max_val == 0:  # Handle the case where all elements are 0
-        max_val = 1
-    arr_normalized = [num / max_val for num in arr]
+BUCKET_SIZE = 64  # Target number of elements per bucket
+SAMPLE_SIZE = 1024  # Elements sampled to place bucket boundaries
 
-    # Put elements into respective buckets
-    for num in arr_normalized:
-        index = min(int(num * (n - 1)), n - 1)  # Ensure index is within range
-        buckets[index].append(num)
 
-    # Sort individual buckets
-    for bucket in buckets:
-        bucket.sort()
-
-    # Concatenate sorted buckets
-    sorted_arr = []
-    for bucket in buckets:
-        sorted_arr.extend(bucket)
+def _bucket_boundaries(values, num_buckets, sample_size=SAMPLE_SIZE, seed=None):
+    """
+    Pick bucket boundaries at the quantiles of a random sample of values, so
+    skewed inputs still spread evenly over the buckets.
+    """
+    if len(values) > sample_size:
+        rng = np.random.default_rng(seed)
+        values = values[rng.integers(0, len(values), size=sample_size)]
 
-    # Denormalize sorted array
-    sorted_arr = [num * max_val for num in sorted_arr]
+    # 'lower' keeps the boundaries as actual input values and in their dtype
+    quantiles = np.linspace(0, 1, num_buckets + 1)[1:-1]
+    boundaries = np.quantile(values, quantiles, method='lower')
 
-    return sorted_arr
+    # Repeated values collapse into one bucket instead of many empty ones
+    return np.unique(boundaries)
 
 
-def measure_time(data):
+def bucket_sort(arr, bucket_size=BUCKET_SIZE, sample_size=SAMPLE_SIZE, seed=None):
     """
-    Measure the average execution time of Bucket Sort for the given data.
+    Sorts the given array using the Bucket Sort algorithm.
+
+    Bucket boundaries come from quantiles of a sample of the input, elements
+    are assigned to buckets and grouped with NumPy, and each bucket is then
+    sorted on its own.
 
     Args:
-        data: The data to sort.
+        arr: A list or NumPy array of numbers.
+        bucket_size: Target number of elements per bucket.
+        sample_size: Number of elements sampled to pick the boundaries.
+        seed: Seed for the sampling, for reproducible bucket layouts.
 
     Returns:
-        The average execution time in seconds.
+        A new sorted list of the original elements, or a NumPy array of the
+        same dtype if arr is one.
+    """
+    # Check if the array is empty or has only one element
+    if len(arr) <= 1:
+        return arr
+
+    values = np.asarray(arr)
+    if values.dtype.kind not in 'iuf':
+        # Python ints wider than 64 bits or non-numeric data
+        return sorted(arr)
+    if values.dtype.kind == 'f' and not isinstance(arr, np.ndarray):
+        if not exact_as_floats(arr):
+            # Ints too large for a float64 only compare exactly as objects
+            return sorted(arr)
+        # Reorder the original objects, so ints mixed in with floats stay ints
+        order = bucket_argsort(values, bucket_size, sample_size, seed)
+        return [arr[i] for i in order.tolist()]
+
+    n = len(values)
+    if values.min() == values.max():
+        sorted_values = values.copy()
+    else:
+        num_buckets = max(1, n // bucket_size)
+        boundaries = _bucket_boundaries(values, num_buckets, sample_size, seed)
+
+        # Put elements into their buckets: bucket ids, then a stable grouping
+        bucket_ids = np.digitize(values, boundaries)
+        order = np.argsort(bucket_ids, kind='stable')
+        sorted_values = values[order]
+        ends = np.cumsum(np.bincount(bucket_ids, minlength=len(boundaries) + 1))
+
+        # Sort individual buckets in place
+        start = 0
+        for end in ends.tolist():
+            if end - start > 1:
+                sorted_values[start:end].sort()
+            start = end
+
+    if isinstance(arr, np.ndarray):
+        return sorted_values
+    return sorted_values.tolist()
+
+
+def bucket_argsort(keys, bucket_size=BUCKET_SIZE, sample_size=SAMPLE_SIZE, seed=None):
+    """
+    Returns the stable permutation that sorts keys, using the same bucket
+    layout as bucket_sort: positions are grouped by bucket with a stable
+    argsort of the bucket ids, then each bucket's positions are ordered by
+    key with a stable sort.
     """
-    start_time = time.time()
-    bucket_sort(data)
-    end_time = time.time()
-    return end_time - start_time
-
-if __name__ == "__main__":
-    # Define the range of data sizes
-    n_values = list(range(100, 1001, 100))
-
-    # Initialize lists to store execution times for each range
-    all_times = [[] for _ in range(6)]
-
-    # Measure execution time for each range and store the times
-    for n in n_values:
-        data1 = random.sample(range(n), n)
-        data2 = random.sample(range(min(1000, n)), n)
-        data3 = random.sample(range(n ** 3), n)
-        data4 = random.sample(range(1, n + 1), n)  # Use n as the upper bound
-        data5 = [random.randint(0, n) * 1000 for _ in range(n)]
-        data6 = list(range(n))
-        num_swaps = math.ceil(math.log(n / 2, 2))
-        for _ in range(num_swaps):
-            idx = random.randint(0, n - 1)
-            idx_swap = random.randint(0, n - 1)
-            data6[idx], data6[idx_swap] = data6[idx_swap], data6[idx]
-
-        all_data = [data1, data2, data3, data4, data5, data6]
-        for i, data in enumerate(all_data):
-            all_times[i].append(measure_time(data))
-
-    # Plot the time complexity for all ranges in one graph
-    plt.figure(figsize=(10, 6))
-    labels = [
-        '[0…n]',
-        '[0…k], k < 1000',
-        '[0…n^3]',
-        '[0…log n]',
-        'Multiples of 1000 in [0…n]',
-        'In-order with Logarithmic Swaps'
-    ]
-    for i, times in enumerate(all_times):
-        plt.plot(n_values, times, label=labels[i])
-
-    plt.xlabel('Data size (n)')
-    plt.ylabel('Average execution time (s)')
-    plt.title('Bucket Sort Time Complexity for Various Ranges')
-    plt.grid(True)
-    plt.legend()
-    plt.show()
+    values = np.asarray(keys)
+    n = len(values)
+    order = np.arange(n, dtype=np.int32 if n < 2 ** 31 else np.int64)
+    if values.dtype.kind not in 'iuf' or (values.dtype.kind == 'f' and not isinstance(keys, np.ndarray)
+                                          and not exact_as_floats(keys)):
+        return order[sorted(range(n), key=list(keys).__getitem__)]
+    if n <= 1 or values.min() == values.max():
+        return order
+
+    num_buckets = max(1, n // bucket_size)
+    boundaries = _bucket_boundaries(values, num_buckets, sample_size, seed)
+    bucket_ids = np.digitize(values, boundaries)
+    order = order[np.argsort(bucket_ids, kind='stable')]
+    ends = np.cumsum(np.bincount(bucket_ids, minlength=len(boundaries) + 1))
+
+    start = 0
+    for end in ends.tolist():
+        if end - start > 1:
+            bucket = order[start:end]
+            order[start:end] = bucket[np.argsort(values[bucket], kind='stable')]
+        start = end
+    return order
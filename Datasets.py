@@ -0,0 +1,130 @@
+import os
+import math
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+CACHE_MIN_SIZE = 10 ** 6  # Datasets from this size on are cached as .npy files
+CACHE_DIR = os.environ.get('SORT_DATASET_CACHE',
+                           os.path.join(os.path.expanduser('~'), '.cache', 'sort-datasets'))
+CACHE_VERSION = 1  # Bump when a generator changes, so stale cache files are ignored
+
+
+def _permutation(n, rng):
+    """
+    Every integer of [0, n) once, shuffled.
+    """
+    return rng.permutation(n)
+
+
+def _small_range(n, rng):
+    """
+    Integers from [0, k) with k = min(1000, n), with repeats.
+    """
+    return rng.integers(0, min(1000, n), size=n)
+
+
+def _cubic(n, rng):
+    """
+    Integers from [0, n^3), distinct but for an expected 1/(2n) collisions.
+    The range is capped at 2^63 so the values fit in int64, which is only
+    reached from n of about 2 million on.
+    """
+    return rng.integers(0, min(n ** 3, 2 ** 63 - 1), size=n, dtype=np.int64)
+
+
+def _log_range(n, rng):
+    """
+    Integers from [0, floor(ln n)], so n values share about ln n distinct
+    keys.
+    """
+    return rng.integers(0, int(math.log(n)) + 1, size=n)
+
+
+def _multiples_1000(n, rng):
+    """
+    Multiples of 1000 of integers from [0, n].
+    """
+    return rng.integers(0, n + 1, size=n) * 1000
+
+
+def _nearly_sorted(n, rng):
+    """
+    0..n-1 in order with ceil(log2(n / 2)) random swaps, done one after the
+    other like the scripts did.
+    """
+    data = np.arange(n)
+    swaps = math.ceil(math.log2(n / 2)) if n > 2 else 0
+    for i, j in rng.integers(0, n, size=(swaps, 2)):
+        data[i], data[j] = data[j], data[i]
+    return data
+
+
+def _urls(n, rng):
+    """
+    Long string keys with shared prefixes, the case American flag sort is for.
+    """
+    tenants = np.char.zfill(rng.integers(0, 100, size=n).astype('U4'), 4)
+    users = np.char.zfill(rng.integers(0, 10 ** 8, size=n).astype('U8'), 8)
+    urls = np.char.add('https://example.com/api/v1/tenants/', tenants)
+    return np.char.add(np.char.add(urls, '/users/'), users)
+
+
+# label: title used in plots and reports
+# generate: function of n and a NumPy Generator returning the data
+# kind: 'int' or 'str'
+# high: function of n giving the largest possible value, None for strings
+Distribution = namedtuple('Distribution', ['label', 'generate', 'kind', 'high'])
+
+DISTRIBUTIONS = {
+    'permutation': Distribution('[0…n]', _permutation, 'int', lambda n: n - 1),
+    'small_range': Distribution('[0…k], k < 1000', _small_range, 'int', lambda n: min(1000, n) - 1),
+    'cubic': Distribution('[0…n^3]', _cubic, 'int', lambda n: min(n ** 3, 2 ** 63 - 1) - 1),
+    'log_range': Distribution('[0…log n]', _log_range, 'int', lambda n: int(math.log(n))),
+    'multiples_1000': Distribution('Multiples of 1000 in [0…n]', _multiples_1000, 'int', lambda n: n * 1000),
+    'nearly_sorted': Distribution('In-order with Logarithmic Swaps', _nearly_sorted, 'int', lambda n: n - 1),
+    'urls': Distribution('URL strings with shared prefixes', _urls, 'str', None),
+}
+
+
+def generate(name, n, seed=0):
+    """
+    Generates n values of the named distribution with vectorized NumPy
+    code. The same name, n and seed always give the same values.
+
+    Returns:
+        A NumPy array, int64 or unicode strings.
+    """
+    rng = np.random.default_rng([seed, n, zlib.crc32(name.encode())])
+    return np.asarray(DISTRIBUTIONS[name].generate(n, rng))
+
+
+def cache_path(name, n, seed=0, cache_dir=None):
+    """
+    Where load keeps the named dataset.
+    """
+    return os.path.join(cache_dir or CACHE_DIR, '%s-n%d-seed%d-v%d.npy' % (name, n, seed, CACHE_VERSION))
+
+
+def load(name, n, seed=0, cache_dir=None):
+    """
+    Returns the dataset generate(name, n, seed). From CACHE_MIN_SIZE values
+    on it is saved as a .npy file the first time and memory mapped read-only
+    afterwards, so large benchmarks start without regenerating their data.
+
+    Returns:
+        A NumPy array, or a read-only np.memmap for cached datasets.
+    """
+    if n < CACHE_MIN_SIZE:
+        return generate(name, n, seed)
+
+    path = cache_path(name, n, seed, cache_dir)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write under a private name first, so readers never see half a file
+        partial = '%s.%d.tmp' % (path, os.getpid())
+        with open(partial, 'wb') as f:
+            np.save(f, generate(name, n, seed))
+        os.replace(partial, path)
+    return np.load(path, mmap_mode='r')
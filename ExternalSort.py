@@ -0,0 +1,185 @@
+import os
+import heapq
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+from Mergesort import merge_runs
+from Radixsort import radix_sort_array
+
+MEMORY_BUDGET = 256 * 2 ** 20  # Peak bytes the sort may allocate, buffers and temporaries included
+WRITE_BUFFER = 8 * 2 ** 20  # Bytes buffered before each write to the output
+WRITE_SHARE = 8  # The write buffer takes at most this fraction (1/8) of the memory budget
+RUN_OVERHEAD = 2048  # Bytes of bookkeeping per run while merging: memory map, block views, heap entry
+
+
+def _chunk_bytes(itemsize):
+    """
+    Peak bytes per element of reading and sorting one chunk, as traced by
+    tracemalloc: the chunk itself, the radix keys with their shifted and
+    masked temporaries and permuted copy, the uint8 digit and the int64
+    permutation; the counting path stays below that.
+    """
+    return 5 * itemsize + 12
+
+
+def _block_bytes(itemsize):
+    """
+    Peak bytes per element of the merge blocks: the block itself, and at
+    worst all of it merged in one step, which merge_runs does with a new
+    array per level and three int64 index temporaries per element.
+    """
+    return 3 * itemsize + 24
+
+
+def _sort_run(values):
+    """
+    Sorts one in-memory chunk. external_sort only accepts dtypes the radix
+    engine handles, which is also the fastest engine for them.
+    """
+    return radix_sort_array(values)
+
+
+def _tail_key(block):
+    """
+    Heap key for the last value of a block. NaN compares false with every
+    number, so it is ranked after all of them explicitly, as np.sort does.
+    """
+    tail = block[-1].item()
+    return (tail != tail, tail)
+
+
+def _write_runs(in_path, dtype, chunk_elements, tmp_dir):
+    """
+    Reads in_path in chunks of chunk_elements, sorts each chunk and writes it
+    to its own file in tmp_dir.
+
+    Returns:
+        The paths of the sorted run files, in the order they were written.
+    """
+    native = dtype.newbyteorder('=')
+    run_paths = []
+    with open(in_path, 'rb') as f:
+        while True:
+            chunk = np.fromfile(f, dtype=dtype, count=chunk_elements)
+            if not len(chunk):
+                break
+            run = _sort_run(chunk.astype(native, copy=False))
+            path = os.path.join(tmp_dir, 'run%06d.bin' % len(run_paths))
+            run.astype(dtype, copy=False).tofile(path)
+            run_paths.append(path)
+            # Let go of this chunk before the next one is read
+            del chunk, run
+    return run_paths
+
+
+def _merge_files(run_paths, out_path, dtype, block_elements, write_buffer=WRITE_BUFFER):
+    """
+    k-way merge of sorted run files into out_path.
+
+    Every run is read through a memory map one block at a time. A heap keyed
+    on the last value of each run's current block tells which block runs
+    out first; everything up to that value in all blocks is final, so it is
+    merged and written out in one piece, and the exhausted blocks are
+    refilled.
+    """
+    native = dtype.newbyteorder('=')
+    runs = [np.memmap(path, dtype=dtype, mode='r') for path in run_paths]
+    positions = [0] * len(runs)
+    blocks = [None] * len(runs)
+
+    def next_block(i):
+        start = positions[i]
+        positions[i] = min(start + block_elements, len(runs[i]))
+        return np.array(runs[i][start:positions[i]], dtype=native)
+
+    heap = []
+    for i in range(len(runs)):
+        blocks[i] = next_block(i)
+        if len(blocks[i]):
+            heap.append((_tail_key(blocks[i]), i))
+    heapq.heapify(heap)
+
+    with open(out_path, 'wb', buffering=write_buffer) as out:
+        while heap:
+            bound = blocks[heap[0][1]][-1]
+
+            # Nothing still on disk is smaller than bound
+            pieces = []
+            for i, block in enumerate(blocks):
+                cut = np.searchsorted(block, bound, side='right')
+                if cut:
+                    pieces.append(block[:cut])
+                    blocks[i] = block[cut:]
+            out.write(memoryview(merge_runs(pieces).astype(dtype, copy=False)))
+
+            # The used up blocks are the ones whose last value was bound,
+            # so they are all at the top of the heap
+            used_up = []
+            while heap and not len(blocks[heap[0][1]]):
+                used_up.append(heapq.heappop(heap)[1])
+            for i in used_up:
+                blocks[i] = next_block(i)
+                if len(blocks[i]):
+                    heapq.heappush(heap, (_tail_key(blocks[i]), i))
+
+    del runs
+
+
+def external_sort(in_path, out_path, dtype='<i8', memory_budget=MEMORY_BUDGET, tmp_dir=None):
+    """
+    Sorts a binary file of fixed-width numbers that may not fit in memory.
+
+    The input is streamed in chunks that fit the memory budget, each chunk
+    is sorted in memory with the radix engine and written out as a run, and
+    the runs are then merged with a buffered k-way heap merge.
+
+    Args:
+        in_path: File of raw values of the given dtype.
+        out_path: Where to write the sorted values, in the same format.
+        dtype: NumPy dtype of the values, e.g. '<i8' or '<f4'.
+        memory_budget: Bytes of memory the sort may allocate at its peak.
+        tmp_dir: Directory for the run files, defaults to the system one.
+
+    Raises:
+        ValueError: If the budget cannot hold one block per run while merging.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind not in 'iuf' or dtype.itemsize > 8:
+        raise TypeError("external_sort needs integers or float16/32/64, got %s" % dtype)
+
+    chunk_elements = max(1, memory_budget // _chunk_bytes(dtype.itemsize))
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        run_paths = _write_runs(in_path, dtype, chunk_elements, run_dir)
+        if len(run_paths) <= 1:
+            # Everything fit in one chunk, the run is the result
+            if run_paths:
+                shutil.move(run_paths[0], out_path)
+            else:
+                open(out_path, 'wb').close()
+            return
+
+        # Binary files cannot be line buffered, a buffer of 1 would mean that
+        write_buffer = max(2, min(WRITE_BUFFER, memory_budget // WRITE_SHARE))
+        block_budget = memory_budget - write_buffer - len(run_paths) * RUN_OVERHEAD
+        block_elements = block_budget // (len(run_paths) * _block_bytes(dtype.itemsize))
+        if block_elements < 1:
+            raise ValueError("a memory budget of %d bytes is too small to merge %d runs"
+                             % (memory_budget, len(run_paths)))
+        _merge_files(run_paths, out_path, dtype, block_elements, write_buffer)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Sort a binary file of fixed-width numbers.')
+    parser.add_argument('in_path')
+    parser.add_argument('out_path')
+    parser.add_argument('--dtype', default='<i8', help='NumPy dtype of the values')
+    parser.add_argument('--memory-mb', type=int, default=MEMORY_BUDGET // 2 ** 20,
+                        help='memory budget in MiB')
+    parser.add_argument('--tmp-dir', default=None, help='directory for the sorted runs')
+    args = parser.parse_args()
+
+    external_sort(args.in_path, args.out_path, args.dtype, args.memory_mb * 2 ** 20, args.tmp_dir)
@@ -1,7 +1,6 @@
-import random
-import time
-import matplotlib.pyplot as plt
-import math
+import functools
+import itertools
+from Argsort import argsort_by
 
 def heapify(arr, n, i):
     """
@@ -24,11 +23,124 @@ def heapify(arr, n, i):
         arr[i], arr[largest] = arr[largest], arr[i]  # Swap
         heapify(arr, n, largest)
 
-def heap_sort(arr):
+HEAP_VARIANTS = ('classic', 'hole', 'bottom_up', 'dary')
+
+
+def _sift_down(arr, lo, i, n):
+    """
+    Iterative sift-down of the element at heap index i in the max heap
+    stored in arr[lo:lo + n]. The element is held aside while larger
+    children move up into the hole, instead of swapping at every level.
+    """
+    item = arr[lo + i]
+    child = 2 * i + 1
+    while child < n:
+        # Pick the larger child
+        if child + 1 < n and arr[lo + child] < arr[lo + child + 1]:
+            child += 1
+        if not item < arr[lo + child]:
+            break
+        arr[lo + i] = arr[lo + child]
+        i = child
+        child = 2 * i + 1
+    arr[lo + i] = item
+
+def _sift_down_floyd(arr, lo, i, n):
+    """
+    Floyd's bottom-up sift-down. The hole is first walked all the way to a
+    leaf along the larger children, one comparison per level, and the
+    element is then sifted back up from there. Since it usually belongs
+    near the bottom this saves about half the comparisons of _sift_down.
+    """
+    item = arr[lo + i]
+    start = i
+
+    # Walk down to a leaf, pulling the larger child up at each level
+    child = 2 * i + 1
+    while child < n:
+        if child + 1 < n and arr[lo + child] < arr[lo + child + 1]:
+            child += 1
+        arr[lo + i] = arr[lo + child]
+        i = child
+        child = 2 * i + 1
+
+    # Sift the element back up to its place
+    while i > start:
+        parent = (i - 1) // 2
+        if not arr[lo + parent] < item:
+            break
+        arr[lo + i] = arr[lo + parent]
+        i = parent
+    arr[lo + i] = item
+
+def _sift_down_dary(arr, lo, i, n, d):
+    """
+    Iterative sift-down in a d-ary max heap stored in arr[lo:lo + n]. The
+    children of node i are d * i + 1 ... d * i + d, so a wider heap is
+    shallower and each level reads d neighbouring elements.
+    """
+    item = arr[lo + i]
+    while True:
+        first = d * i + 1
+        if first >= n:
+            break
+
+        # Pick the largest of up to d children
+        child = first
+        for c in range(first + 1, min(first + d, n)):
+            if arr[lo + child] < arr[lo + c]:
+                child = c
+
+        if not item < arr[lo + child]:
+            break
+        arr[lo + i] = arr[lo + child]
+        i = child
+    arr[lo + i] = item
+
+def heap_sort_range(arr, lo, hi, variant='hole', d=4):
+    """
+    Heap Sort of the slice arr[lo:hi], in place.
+
+    Args:
+        arr: The list to sort.
+        lo, hi: Bounds of the slice to sort.
+        variant: 'hole' for the iterative sift-down, 'bottom_up' for Floyd's
+            variant, or 'dary' for a d-ary heap.
+        d: Arity of the heap for the 'dary' variant.
+    """
+    n = hi - lo
+    if variant == 'hole':
+        sift, d = _sift_down, 2
+    elif variant == 'bottom_up':
+        sift, d = _sift_down_floyd, 2
+    elif variant == 'dary':
+        sift = functools.partial(_sift_down_dary, d=d)
+    else:
+        raise ValueError("unknown heap sort variant %r" % (variant,))
+
+    # Build max heap
+    for i in range((n - 2) // d, -1, -1):
+        sift(arr, lo, i, n)
+
+    # Extract elements one by one
+    for i in range(n - 1, 0, -1):
+        arr[lo + i], arr[lo] = arr[lo], arr[lo + i]  # Swap
+        sift(arr, lo, 0, i)
+
+def heap_sort(arr, variant='classic', d=4):
     """
     Heap Sort algorithm.
+
+    Args:
+        arr: The list to sort in place.
+        variant: One of HEAP_VARIANTS. 'classic' uses the recursive heapify,
+            the others are described in heap_sort_range.
+        d: Arity of the heap for the 'dary' variant.
     """
     n = len(arr)
+    if variant != 'classic':
+        heap_sort_range(arr, 0, n, variant, d)
+        return
 
     # Build max heap
     for i in range(n // 2 - 1, -1, -1):
@@ -39,63 +151,37 @@ def heap_sort(arr):
         arr[i], arr[0] = arr[0], arr[i]  # Swap
         heapify(arr, i, 0)
 
-def measure_time(data):
+def top_k(iterable, k):
     """
-    Measures the average execution time of Heap Sort for the given data.
+    Returns the k smallest elements of iterable in ascending order.
 
-    Args:
-        data: The data to sort.
-
-    Returns:
-        The average execution time in seconds.
-    """
-    start_time = time.time()
-    heap_sort(data)
-    end_time = time.time()
-    return end_time - start_time
-
-if __name__ == "__main__":
-    # Define the range of data sizes
-    n_values = list(range(100, 1001, 100))
-
-    # Initialize lists to store execution times for each range
-    all_times = [[] for _ in range(6)]
-
-    # Measure execution time for each range and store the times
-    for n in n_values:
-        data1 = random.sample(range(n), n)
-        data2 = random.sample(range(min(1000, n)), n)
-        data3 = random.sample(range(n ** 3), n)
-        data4 = [random.randint(0, int(math.log(n))) for _ in range(n)]
-
-        data5 = [random.randint(0, n) * 1000 for _ in range(n)]
-        data6 = list(range(n))
-        num_swaps = math.ceil(math.log(n / 2, 2))
-        for _ in range(num_swaps):
-            idx = random.randint(0, n - 1)
-            idx_swap = random.randint(0, n - 1)
-            data6[idx], data6[idx_swap] = data6[idx_swap], data6[idx]
-
-        all_data = [data1, data2, data3, data4, data5, data6]
-        for i, data in enumerate(all_data):
-            all_times[i].append(measure_time(data))
-
-    # Plot the time complexity for all ranges in one graph
-    plt.figure(figsize=(10, 6))
-    labels = [
-        '[0…n]',
-        '[0…k], k < 1000',
-        '[0…n^3]',
-        '[0…log n]',
-        'Multiples of 1000 in [0…n]',
-        'In-order with Logarithmic Swaps'
-    ]
-    for i, times in enumerate(all_times):
-        plt.plot(n_values, times, label=labels[i])
-
-    plt.xlabel('Data size (n)')
-    plt.ylabel('Average execution time (s)')
-    plt.title('Heap Sort Time Complexity for Various Ranges')
-    plt.grid(True)
-    plt.legend()
-    plt.show()
+    The input is consumed one element at a time while a max heap of the k
+    smallest seen so far is kept, so it takes O(n log k) time and O(k)
+    memory and works on streams as well as lists.
+    """
+    if k <= 0:
+        return []
+
+    it = iter(iterable)
+    heap = list(itertools.islice(it, k))
+    n = len(heap)
+
+    # Build max heap
+    for i in range(n // 2 - 1, -1, -1):
+        heapify(heap, n, i)
+
+    # Replace the largest kept element whenever a smaller one arrives
+    for x in it:
+        if x < heap[0]:
+            heap[0] = x
+            heapify(heap, n, 0)
+
+    heap_sort(heap)
+    return heap
+
+def heap_sort_argsort(keys, variant='classic', d=4):
+    """
+    Returns the stable permutation that sorts keys, found with heap_sort.
+    Heap Sort itself is not stable, but ties are broken by position.
+    """
+    return argsort_by(functools.partial(heap_sort, variant=variant, d=d), keys)
@@ -0,0 +1,227 @@
+import os
+import sys
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))  # Calls into code outside it are not counted
+THIS_FILE = os.path.abspath(__file__)  # Nor are the proxies' own methods
+
+
+class Counts:
+    """
+    Operation counts of one instrumented sort.
+    """
+    __slots__ = ('comparisons', 'moves', 'allocations', 'allocated_elements', 'max_depth', 'calls', 'untracked')
+
+    def __init__(self):
+        self.comparisons = 0
+        self.moves = 0
+        self.allocations = 0
+        self.allocated_elements = 0
+        self.max_depth = 0
+        self.calls = Counter()
+        self.untracked = False  # Elements were moved where TrackedList cannot see them
+
+    def as_dict(self):
+        """
+        The counts as a plain dict, for JSON output. Moves and allocations
+        are None if the sort moved elements outside the tracked lists, as
+        zeros or partial counts would pass for real measurements.
+        """
+        return {
+            'comparisons': self.comparisons,
+            'moves': None if self.untracked else self.moves,
+            'allocations': None if self.untracked else self.allocations,
+            'allocated_elements': None if self.untracked else self.allocated_elements,
+            'max_depth': self.max_depth,
+            'calls': dict(self.calls),
+        }
+
+
+def _value(x):
+    """
+    The value behind a proxy, or x itself if it is not one.
+    """
+    return x.value if isinstance(x, Counted) else x
+
+
+class Counted:
+    """
+    Proxy for one element that counts every comparison made on it. Sorting
+    proxies instead of the values themselves is the instrumented path, so
+    the plain sorts carry no counting code at all.
+    """
+    __slots__ = ('value', 'counts')
+
+    def __init__(self, value, counts):
+        self.value = value
+        self.counts = counts
+
+    def __lt__(self, other):
+        self.counts.comparisons += 1
+        return self.value < _value(other)
+
+    def __le__(self, other):
+        self.counts.comparisons += 1
+        return self.value <= _value(other)
+
+    def __gt__(self, other):
+        self.counts.comparisons += 1
+        return self.value > _value(other)
+
+    def __ge__(self, other):
+        self.counts.comparisons += 1
+        return self.value >= _value(other)
+
+    def __eq__(self, other):
+        self.counts.comparisons += 1
+        return self.value == _value(other)
+
+    def __ne__(self, other):
+        self.counts.comparisons += 1
+        return self.value != _value(other)
+
+    __hash__ = None
+
+
+class TrackedList(list):
+    """
+    List that counts the elements written into it, and the slices copied
+    out of it as temporary allocations. Slices are TrackedLists as well, so
+    the halves a recursive merge sort works on are tracked too. Lists an
+    algorithm builds from scratch, e.g. quick_sort's partitions or a
+    [None] * n buffer, are plain lists; _profiler notices them being handed
+    to a function and marks the counts untracked.
+    """
+    __slots__ = ('counts',)
+
+    def __init__(self, items, counts):
+        super().__init__(items)
+        self.counts = counts
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self.counts.moves += len(value)
+        else:
+            self.counts.moves += 1
+        super().__setitem__(index, value)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            part = TrackedList(super().__getitem__(index), self.counts)
+            self.counts.allocations += 1
+            self.counts.allocated_elements += len(part)
+            self.counts.moves += len(part)
+            return part
+        return super().__getitem__(index)
+
+    def sort(self, *args, **kwargs):
+        # list.sort moves the elements in C, past __setitem__
+        self.counts.untracked = True
+        super().sort(*args, **kwargs)
+
+
+def _profiler(counts):
+    """
+    sys.setprofile hook counting calls to, and the deepest nesting of,
+    functions defined in this package. A call given a plain list or a NumPy
+    array means the algorithm works on data of its own, whose moves are not
+    seen.
+    """
+    depth = 0
+
+    def profile(frame, event, arg):
+        nonlocal depth
+        filename = frame.f_code.co_filename
+        if filename == THIS_FILE or not filename.startswith(PACKAGE_DIR):
+            return
+        if event == 'call':
+            depth += 1
+            if depth > counts.max_depth:
+                counts.max_depth = depth
+            counts.calls[frame.f_code.co_name] += 1
+            if not counts.untracked and any(type(value) is list or isinstance(value, np.ndarray)
+                                            for value in frame.f_locals.values()):
+                counts.untracked = True
+        elif event == 'return':
+            depth -= 1
+
+    return profile
+
+
+def count_operations(sort_fn, data, compare=True):
+    """
+    Runs sort_fn once on a copy of data and counts what it did.
+
+    Args:
+        sort_fn: Sort that takes a list and sorts it in place or returns the
+            sorted result.
+        data: The values to sort.
+        compare: Wrap every value in a comparison counting proxy. Turn off
+            for sorts that need the raw numbers or strings, such as the
+            radix engines; they make no Python level comparisons anyway.
+
+    Returns:
+        A dict of comparisons, element moves, temporary allocations and the
+        elements they held, the deepest nesting of this package's functions
+        (1 for the outermost call) and the number of calls of each of them.
+        Comparisons are counted even when C code such as list.sort makes
+        them; other work done in C, such as NumPy's, only shows through the
+        calls it was made from. Moves and allocations are only seen in
+        sorts that work in Python on the list they are given and its
+        slices, and are None for any other sort.
+    """
+    counts = Counts()
+    items = [Counted(x, counts) for x in data] if compare else list(data)
+    tracked = TrackedList(items, counts)
+
+    previous = sys.getprofile()
+    sys.setprofile(_profiler(counts))
+    try:
+        result = sort_fn(tracked)
+    finally:
+        sys.setprofile(previous)
+    if result is not None and result is not tracked:
+        # The sorted elements were moved into a new list
+        counts.untracked = True
+
+    return counts.as_dict()
+
+
+def measure_memory(sort_fn, data):
+    """
+    Runs sort_fn once on a copy of data under tracemalloc, a NumPy array if
+    data is one and a list otherwise. The copy is made before tracing
+    starts, so only memory the sort itself allocates counts, NumPy buffers
+    included.
+
+    Returns:
+        A dict of the peak of traced memory in bytes, that peak per input
+        element, and the bytes and memory blocks still allocated when the
+        sort returned, e.g. a new result list. The number of allocations
+        made is not recorded: tracemalloc only shows the blocks alive at
+        one moment, so an in-place sort reports about one retained block
+        however many temporaries it made and freed along the way.
+    """
+    if tracemalloc.is_tracing():
+        raise RuntimeError("measure_memory needs tracemalloc, which is already tracing")
+
+    items = data.copy() if isinstance(data, np.ndarray) else list(data)
+    tracemalloc.start()
+    try:
+        result = sort_fn(items)
+        retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return {
+        'peak_bytes': peak_bytes,
+        'bytes_per_element': peak_bytes / max(1, len(items)),
+        'retained_bytes': retained_bytes,
+        'retained_blocks': sum(stat.count for stat in snapshot.statistics('filename')),
+    }
@@ -1,7 +1,7 @@
-import random
-import time
-import matplotlib.pyplot as plt
-import math
+import itertools
+from bisect import bisect_left, bisect_right
+import numpy as np
+from Argsort import argsort_by
 
 def merge_sort(arr):
     """
@@ -39,62 +39,349 @@ def merge_sort(arr):
         j += 1
         k += 1
 
-def measure_time(data):
+INSERTION_CUTOFF = 32  # Runs up to this length are sorted by insertion sort
+
+
+def _insertion_sort(arr, lo, hi):
+    """
+    Sorts arr[lo:hi] in place using insertion sort.
     """
-    Measures the average execution time of Merge Sort for the given data.
+    for i in range(lo + 1, hi):
+        item = arr[i]
+        j = i - 1
+        while j >= lo and item < arr[j]:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = item
 
-    Args:
-        data: The data to sort.
+def _merge(src, dst, lo, mid, hi):
+    """
+    Merges the sorted runs src[lo:mid] and src[mid:hi] into dst[lo:hi].
+    Ties are taken from the left run, so the merge is stable.
+    """
+    i, j, k = lo, mid, lo
+
+    while i < mid and j < hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+        else:
+            dst[k] = src[i]
+            i += 1
+        k += 1
+
+    # Only one run has elements left, copy them over in one go
+    if i < mid:
+        dst[k:hi] = src[i:mid]
+    else:
+        dst[k:hi] = src[j:hi]
+
+def merge_sort_bottom_up(arr, cutoff=INSERTION_CUTOFF):
+    """
+    Sorts the given array in place using an iterative bottom-up Merge Sort.
+
+    Runs of cutoff elements are first sorted by insertion sort, then merged
+    pairwise with doubling width, ping-ponging between arr and a single
+    auxiliary buffer. Adjacent runs that are already in order are copied
+    across without merging.
+    """
+    n = len(arr)
+    if n <= 1:
+        return
+
+    for lo in range(0, n, cutoff):
+        _insertion_sort(arr, lo, min(lo + cutoff, n))
+
+    src, dst = arr, [None] * n
+    width = cutoff
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            if mid == hi or not src[mid] < src[mid - 1]:
+                # Right run starts after the left one ends: nothing to merge
+                dst[lo:hi] = src[lo:hi]
+            else:
+                _merge(src, dst, lo, mid, hi)
+        src, dst = dst, src
+        width *= 2
+
+    if src is not arr:
+        arr[:] = src
+
+def merge_arrays(a, b):
+    """
+    Stable merge of two sorted NumPy arrays. Every element's output position
+    is its own index plus the number of elements of the other array that go
+    before it, found with a vectorized binary search.
+    """
+    merged = np.empty(len(a) + len(b), dtype=np.result_type(a, b))
+    merged[np.arange(len(a)) + np.searchsorted(b, a, side='left')] = a
+    merged[np.arange(len(b)) + np.searchsorted(a, b, side='right')] = b
+    return merged
+
+def merge_runs(runs):
+    """
+    Merges a list of sorted NumPy arrays pairwise, like the levels of a
+    bottom-up Merge Sort, and returns the single sorted array.
+    """
+    if not runs:
+        return np.empty(0)
+    while len(runs) > 1:
+        merged = [merge_arrays(runs[i], runs[i + 1]) for i in range(0, len(runs) - 1, 2)]
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    return runs[0]
+
+def _gallop_left(seq, x, lo, hi):
+    """
+    Leftmost position in seq[lo:hi] where x could be inserted, found by
+    exponential search from lo: probes at lo + 1, 2, 4, ... bracket the
+    answer, which a binary search then pins down. Takes O(log d) comparisons
+    for an answer d places after lo.
+    """
+    step = 1
+    while lo + step < hi and seq[lo + step] < x:
+        step *= 2
+    return bisect_left(seq, x, lo + step // 2, min(lo + step, hi))
+
+def _gallop_right(seq, x, lo, hi):
+    """
+    Like _gallop_left, but the position after any elements equal to x.
+    """
+    step = 1
+    while lo + step < hi and not x < seq[lo + step]:
+        step *= 2
+    return bisect_right(seq, x, lo + step // 2, min(lo + step, hi))
+
+def _is_array(a, b):
+    """
+    True if either input is a NumPy array, which selects the vectorized path.
+    """
+    return isinstance(a, np.ndarray) or isinstance(b, np.ndarray)
+
+def sorted_intersection(a, b):
+    """
+    Values found in both a and b, which must be sorted without duplicates.
+
+    Every value of the shorter input is galloped for in the longer one,
+    each search starting where the last one ended, so for lengths m <= n
+    this takes O(m log(n/m)) comparisons. NumPy arrays are searched in one
+    vectorized batch.
+
+    Returns:
+        A sorted list, or a NumPy array if either input is one.
+    """
+    if len(b) < len(a):
+        a, b = b, a
+    if _is_array(a, b):
+        a, b = np.asarray(a), np.asarray(b)
+        pos = np.searchsorted(b, a)
+        found = b[np.minimum(pos, len(b) - 1)] == a if len(b) else np.zeros(len(a), dtype=bool)
+        return a[found]
+
+    result = []
+    pos = 0
+    for x in a:
+        pos = _gallop_left(b, x, pos, len(b))
+        if pos == len(b):
+            break
+        if not x < b[pos]:
+            result.append(x)
+    return result
+
+def sorted_difference(a, b):
+    """
+    Values of a not found in b, both sorted without duplicates.
+
+    The shorter input is walked and galloped for in the longer one, and runs
+    of a between matches are copied in slices, so the comparisons are
+    O(m log(n/m)) for lengths m <= n. NumPy arrays are searched in one
+    vectorized batch.
+
+    Returns:
+        A sorted list, or a NumPy array if either input is one.
+    """
+    if _is_array(a, b):
+        a, b = np.asarray(a), np.asarray(b)
+        if not len(b):
+            return a.copy()
+        pos = np.searchsorted(b, a)
+        return a[b[np.minimum(pos, len(b) - 1)] != a]
+
+    result = []
+    pos = 0
+    if len(a) <= len(b):
+        for x in a:
+            pos = _gallop_left(b, x, pos, len(b))
+            if pos == len(b) or x < b[pos]:
+                result.append(x)
+        return result
+
+    for x in b:
+        end = _gallop_left(a, x, pos, len(a))
+        result.extend(a[pos:end])
+        pos = end + 1 if end < len(a) and not x < a[end] else end
+    result.extend(a[pos:])
+    return result
+
+def sorted_union(a, b):
+    """
+    Values found in a or b, both sorted without duplicates, each once.
+
+    Every value of the shorter input is galloped into the longer one and the
+    runs in between are copied in slices, so the comparisons are
+    O(m log(n/m)) for lengths m <= n. For NumPy arrays the values missing
+    from the longer input are found and inserted in vectorized batches.
+
+    Returns:
+        A sorted list, or a NumPy array if either input is one.
+    """
+    if len(b) < len(a):
+        a, b = b, a
+    if _is_array(a, b):
+        a, b = np.asarray(a), np.asarray(b)
+        extra = sorted_difference(a, b)
+        return np.insert(b.astype(np.result_type(a, b), copy=False), np.searchsorted(b, extra), extra)
+
+    result = []
+    pos = 0
+    for x in a:
+        end = _gallop_left(b, x, pos, len(b))
+        result.extend(b[pos:end])
+        result.append(x)
+        pos = end + 1 if end < len(b) and not x < b[end] else end
+    result.extend(b[pos:])
+    return result
+
+def merge_into(target, batch):
+    """
+    Stable merge of a sorted batch into a sorted target, for adding a few
+    new items to a large sorted list.
+
+    Each item of the shorter input is galloped into the longer one and the
+    runs in between are copied in slices, so the comparisons are
+    O(m log(n/m)) for lengths m <= n. Duplicates are kept and ties go to
+    target.
 
     Returns:
-        The average execution time in seconds.
-    """
-    start_time = time.time()
-    merge_sort(data)
-    end_time = time.time()
-    return end_time - start_time
-
-if __name__ == "__main__":
-    # Define the range of data sizes
-    n_values = list(range(100, 1001, 100))
-
-    # Initialize lists to store execution times for each range
-    all_times = [[] for _ in range(6)]
-
-    # Measure execution time for each range and store the times
-    for n in n_values:
-        data1 = random.sample(range(n), n)
-        data2 = random.sample(range(min(1000, n)), n)
-        data3 = random.sample(range(n ** 3), n)
-        data4 = [random.randint(0, int(math.log(n))) for _ in range(n)]
-        data5 = [random.randint(0, n) * 1000 for _ in range(n)]
-        data6 = list(range(n))
-        num_swaps = math.ceil(math.log(n / 2, 2))
-        for _ in range(num_swaps):
-            idx = random.randint(0, n - 1)
-            idx_swap = random.randint(0, n - 1)
-            data6[idx], data6[idx_swap] = data6[idx_swap], data6[idx]
-
-        all_data = [data1, data2, data3, data4, data5, data6]
-        for i, data in enumerate(all_data):
-            all_times[i].append(measure_time(data))
-
-    # Plot the time complexity for all ranges in one graph
-    plt.figure(figsize=(10, 6))
-    labels = [
-        '[0…n]',
-        '[0…k], k < 1000',
-        '[0…n^3]',
-        '[0…log n]',
-        'Multiples of 1000 in [0…n]',
-        'In-order with Logarithmic Swaps'
-    ]
-    for i, times in enumerate(all_times):
-        plt.plot(n_values, times, label=labels[i])
-
-    plt.xlabel('Data size (n)')
-    plt.ylabel('Average execution time (s)')
-    plt.title('Merge Sort Time Complexity for Various Ranges')
-    plt.grid(True)
-    plt.legend()
-    plt.show()
+        target, now holding the merged items. NumPy arrays cannot grow, so
+        for them a new array is returned instead, built with one vectorized
+        binary search and insert.
+    """
+    if isinstance(target, np.ndarray):
+        batch = np.asarray(batch)
+        merged = target.astype(np.result_type(target, batch), copy=False)
+        return np.insert(merged, np.searchsorted(target, batch, side='right'), batch)
+
+    if len(batch) <= len(target):
+        small, large, gallop = batch, target, _gallop_right
+    else:
+        # Walk the target instead; its items go before equal batch items
+        small, large, gallop = target, batch, _gallop_left
+
+    result = []
+    pos = 0
+    for x in small:
+        end = gallop(large, x, pos, len(large))
+        result.extend(large[pos:end])
+        result.append(x)
+        pos = end
+    result.extend(large[pos:])
+    target[:] = result
+    return target
+
+MERGE_BATCH = 256  # Items pulled from each source at a time by merge_sorted
+
+
+def merge_sorted(*iterables, key=None, batch_size=MERGE_BATCH):
+    """
+    Lazily merges already sorted iterables into one sorted stream.
+
+    The sources sit at the leaves of a loser tree: every internal node keeps
+    the loser of the match played there and the overall winner is at the
+    top, so after an item is taken only the path from its leaf to the root
+    is replayed, which is O(log k) comparisons. Sources are read batch_size
+    items at a time and at most one batch per source is held in memory.
+    Ties go to the earlier iterable, so the merge is stable.
+
+    Args:
+        *iterables: Iterables that are each sorted by key.
+        key: Function computing the comparison key, once per item.
+        batch_size: Number of items pulled from a source at a time.
+
+    Yields:
+        The items of all iterables in sorted order.
+    """
+    sources = [iter(it) for it in iterables]
+    k = len(sources)
+    if k == 0:
+        return
+
+    batches = [None] * k
+    keys = [None] * k
+    positions = [0] * k
+    done = [False] * k
+
+    def refill(i):
+        batch = list(itertools.islice(sources[i], batch_size))
+        batches[i] = batch
+        keys[i] = batch if key is None else [key(item) for item in batch]
+        positions[i] = 0
+        done[i] = not batch
+
+    def beats(i, j):
+        # True if the current item of source i goes out before that of j
+        if done[i]:
+            return False
+        if done[j]:
+            return True
+        a = keys[i][positions[i]]
+        b = keys[j][positions[j]]
+        return not b < a if i < j else a < b
+
+    for i in range(k):
+        refill(i)
+
+    # Play the initial tournament; leaf i sits at node k + i
+    tree = [0] * k
+    winners = [0] * k + list(range(k))
+    for node in range(k - 1, 0, -1):
+        a, b = winners[2 * node], winners[2 * node + 1]
+        if beats(a, b):
+            winners[node], tree[node] = a, b
+        else:
+            winners[node], tree[node] = b, a
+    tree[0] = winners[1] if k > 1 else 0
+
+    while True:
+        winner = tree[0]
+        if done[winner]:
+            return
+
+        yield batches[winner][positions[winner]]
+        positions[winner] += 1
+        if positions[winner] == len(batches[winner]):
+            refill(winner)
+
+        # Replay the matches on the path from the winner's leaf to the root
+        node = (winner + k) // 2
+        while node:
+            if beats(tree[node], winner):
+                tree[node], winner = winner, tree[node]
+            node //= 2
+        tree[0] = winner
+
+def merge_sort_argsort(keys):
+    """
+    Returns the stable permutation that sorts keys, found with merge_sort.
+    """
+    return argsort_by(merge_sort, keys)
+
+def merge_sort_bottom_up_argsort(keys):
+    """
+    Returns the stable permutation that sorts keys, found with
+    merge_sort_bottom_up.
+    """
+    return argsort_by(merge_sort_bottom_up, keys)
@@ -0,0 +1,206 @@
+import os
+import sys
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Mergesort import merge_runs
+from SortEngines import ENGINES, sort_array
+
+MIN_CHUNK = 10000  # Below this many elements per worker a serial sort wins
+SAMPLES_PER_CHUNK = 32  # Regular samples taken from each sorted chunk
+
+
+def _attach(name, size, dtype):
+    """
+    Attaches to a shared memory block created by the parent process and
+    views it as a 1-D array.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(size, dtype=dtype, buffer=shm.buf)
+
+
+def _sort_chunk(task):
+    """
+    Worker: sorts data[lo:hi] of the shared input in place.
+    """
+    name, size, dtype, lo, hi, algorithm = task
+    shm, data = _attach(name, size, dtype)
+    try:
+        data[lo:hi] = sort_array(algorithm, data[lo:hi])
+    finally:
+        del data
+        shm.close()
+
+
+def _merge_partition(task):
+    """
+    Worker: merges one slice of every sorted chunk of the shared input into
+    its place in the shared output.
+    """
+    src_name, dst_name, size, dtype, bounds, out_lo = task
+    src_shm, src = _attach(src_name, size, dtype)
+    dst_shm, dst = _attach(dst_name, size, dtype)
+    try:
+        merged = merge_runs([src[lo:hi] for lo, hi in bounds if hi > lo])
+        dst[out_lo:out_lo + len(merged)] = merged
+    finally:
+        del src, dst
+        src_shm.close()
+        dst_shm.close()
+
+
+def _chunk_bounds(n, parts):
+    """
+    Splits range(n) into parts contiguous (lo, hi) pieces of near equal size.
+    """
+    edges = [n * i // parts for i in range(parts + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _splitters(data, chunks, parts):
+    """
+    Picks parts - 1 splitter values by regular sampling of the sorted chunks,
+    as in sample sort, so every merge partition gets a similar share.
+    """
+    samples = np.concatenate([
+        data[lo:hi][np.linspace(0, hi - lo - 1, SAMPLES_PER_CHUNK).astype(np.intp)]
+        for lo, hi in chunks if hi > lo
+    ])
+    samples.sort()
+    return samples[np.linspace(0, len(samples) - 1, parts + 1)[1:-1].astype(np.intp)]
+
+
+def _effective_workers(n, workers):
+    """
+    Caps the number of workers so every chunk has at least MIN_CHUNK elements.
+    """
+    workers = workers or os.cpu_count() or 1
+    return max(1, min(workers, n // MIN_CHUNK))
+
+
+def parallel_sort(arr, algorithm='merge_sort', workers=None):
+    """
+    Sorts the given array on several cores.
+
+    The input is copied once into a shared memory block. Each worker sorts
+    one contiguous chunk of it in place with the chosen algorithm, then the
+    sorted chunks are cut at common splitter values and every worker merges
+    one of the resulting partitions straight into a shared output block.
+    Only names and indices are sent to the workers, never the data.
+
+    Args:
+        arr: A list or NumPy array of fixed-width numbers.
+        algorithm: Name of the engine used on each chunk, a key of ENGINES.
+        workers: Number of processes, defaults to the number of CPUs.
+
+    Returns:
+        A new sorted list, or a NumPy array if arr is one.
+    """
+    if algorithm not in ENGINES:
+        raise ValueError("unknown sort algorithm %r" % (algorithm,))
+
+    values = np.asarray(arr)
+    if values.dtype.kind not in 'iuf':
+        raise TypeError("parallel_sort needs fixed-width numbers, got %s" % values.dtype)
+
+    workers = _effective_workers(len(values), workers)
+    if workers == 1:
+        result = sort_array(algorithm, values)
+    else:
+        result = _parallel_sort(values, algorithm, workers)
+
+    if isinstance(arr, np.ndarray):
+        return result
+    return result.tolist()
+
+
+def _parallel_sort(values, algorithm, workers):
+    """
+    The multi-process part of parallel_sort.
+    """
+    n, dtype = len(values), values.dtype
+    src_shm = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+    dst_shm = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+    try:
+        src = np.ndarray(n, dtype=dtype, buffer=src_shm.buf)
+        dst = np.ndarray(n, dtype=dtype, buffer=dst_shm.buf)
+        src[:] = values
+
+        with multiprocessing.Pool(workers) as pool:
+            # Sort every chunk in place
+            chunks = _chunk_bounds(n, workers)
+            pool.map(_sort_chunk, [
+                (src_shm.name, n, dtype, lo, hi, algorithm) for lo, hi in chunks
+            ])
+
+            # Cut each sorted chunk at the splitters
+            splitters = _splitters(src, chunks, workers)
+            cuts = [
+                [lo] + (lo + np.searchsorted(src[lo:hi], splitters, side='right')).tolist() + [hi]
+                for lo, hi in chunks
+            ]
+
+            # Partition p gets piece p of every chunk, written at out_lo
+            tasks = []
+            out_lo = 0
+            for p in range(workers):
+                bounds = [(cut[p], cut[p + 1]) for cut in cuts]
+                tasks.append((src_shm.name, dst_shm.name, n, dtype, bounds, out_lo))
+                out_lo += sum(hi - lo for lo, hi in bounds)
+            pool.map(_merge_partition, tasks)
+
+        result = dst.copy()
+        del src, dst
+        return result
+    finally:
+        src_shm.close()
+        src_shm.unlink()
+        dst_shm.close()
+        dst_shm.unlink()
+
+
+def measure_speedup(arr, algorithm='merge_sort', workers=None):
+    """
+    Times parallel_sort against the single-core version of the same
+    algorithm on the same data.
+
+    Returns:
+        A dict with the serial and parallel times in seconds, the speedup
+        and the number of workers used.
+    """
+    values = np.asarray(arr)
+    workers = _effective_workers(len(values), workers)
+
+    start_time = time.perf_counter()
+    expected = sort_array(algorithm, values)
+    serial_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    result = parallel_sort(values, algorithm, workers)
+    parallel_time = time.perf_counter() - start_time
+
+    if not np.array_equal(result, expected):
+        raise AssertionError("parallel %s disagrees with the serial result" % algorithm)
+
+    return {
+        'algorithm': algorithm,
+        'workers': workers,
+        'serial_time': serial_time,
+        'parallel_time': parallel_time,
+        'speedup': serial_time / parallel_time,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    data = np.random.default_rng().integers(0, n, size=n)
+
+    for name in ENGINES:
+        report = measure_speedup(data, name, workers)
+        print('%-22s workers=%-3d serial=%.3fs parallel=%.3fs speedup=%.2fx' % (
+            name, report['workers'], report['serial_time'],
+            report['parallel_time'], report['speedup']))
@@ -0,0 +1,198 @@
+import numpy as np
+
+SPLIT_ROUNDS = 8  # Vectorized rounds before split_presorted falls back to the Python pass
+
+
+def _scan(arr):
+    """
+    One pass over arr that counts descents and the longest ascending run
+    while greedily splitting it into an ascending subsequence and the rest.
+    Whenever an element is smaller than the last one kept, both are set
+    aside. Every such pair holds at least one element of any longest
+    ascending subsequence's complement, so at most 2 * (n - LIS) elements
+    are set aside.
+
+    Returns:
+        The kept values, their positions, the set aside values, their
+        positions, the number of descents and the longest run length.
+    """
+    kept, kept_index, removed, removed_index = [], [], [], []
+    descents = 0
+    run = longest_run = 0
+    prev = None
+
+    for i, x in enumerate(arr):
+        if i and x < prev:
+            descents += 1
+            run = 1
+        else:
+            run += 1
+        if run > longest_run:
+            longest_run = run
+        prev = x
+
+        if kept and x < kept[-1]:
+            removed.append(kept.pop())
+            removed_index.append(kept_index.pop())
+            removed.append(x)
+            removed_index.append(i)
+        else:
+            kept.append(x)
+            kept_index.append(i)
+
+    return kept, kept_index, removed, removed_index, descents, longest_run
+
+
+def _numeric(arr):
+    """
+    True if arr is a NumPy array of integers or of floats without NaN, which
+    the vectorized split handles.
+    """
+    if not isinstance(arr, np.ndarray) or arr.ndim != 1 or arr.dtype.kind not in 'iuf':
+        return False
+    return arr.dtype.kind != 'f' or not np.isnan(arr).any()
+
+
+def _split_array(values):
+    """
+    Vectorized split of a numeric array. Each round drops both elements of
+    every adjacent pair that is out of order; no ascending subsequence can
+    hold both, so again at most 2 * (n - LIS) elements are dropped. Sorted
+    input takes one round and a few scattered swaps two.
+
+    Returns:
+        The same four parts as _scan as arrays, or None if the rest is still
+        unsorted after SPLIT_ROUNDS rounds.
+    """
+    kept, kept_index = values, np.arange(len(values))
+    removed_index = []
+
+    for _ in range(SPLIT_ROUNDS):
+        down = np.flatnonzero(kept[1:] < kept[:-1])
+        if not len(down):
+            removed_index = np.sort(np.concatenate(removed_index or [kept_index[:0]]))
+            return kept, kept_index, values[removed_index], removed_index
+        keep = np.ones(len(kept), dtype=bool)
+        keep[down] = False
+        keep[down + 1] = False
+        removed_index.append(kept_index[~keep])
+        kept, kept_index = kept[keep], kept_index[keep]
+    return None
+
+
+def split_presorted(arr):
+    """
+    Splits arr in linear time into an ascending subsequence and the
+    elements that are out of place around it. Integer arrays and float
+    arrays without NaN are split with vectorized NumPy code.
+
+    Returns:
+        The ascending values and their positions in arr, then the out of
+        place values and their positions, as arrays for NumPy input and
+        lists otherwise.
+    """
+    if _numeric(arr):
+        parts = _split_array(arr)
+        if parts is not None:
+            return parts
+    if isinstance(arr, np.ndarray):
+        arr = arr.tolist()
+    return _scan(arr)[:4]
+
+
+def presortedness(arr):
+    """
+    Measures how far arr is from sorted in linear time: a single pass for
+    lists, a few vectorized passes for numeric arrays.
+
+    Returns:
+        A dict with n, the number of natural ascending runs, descents
+        (adjacent pairs out of order), the longest run, a lower bound on the
+        longest ascending subsequence and the number of elements out of
+        place around it, which is at most twice the true minimum.
+    """
+    parts = _split_array(arr) if _numeric(arr) else None
+    if parts is None:
+        if isinstance(arr, np.ndarray):
+            arr = arr.tolist()
+        kept, _, removed, _, descents, longest_run = _scan(arr)
+    else:
+        kept, _, removed, _ = parts
+        starts = np.flatnonzero(arr[1:] < arr[:-1]) + 1
+        descents = len(starts)
+        longest_run = int(np.diff(starts, prepend=0, append=len(arr)).max()) if len(arr) else 0
+
+    return {
+        'n': len(arr),
+        'runs': descents + 1 if len(arr) else 0,
+        'descents': descents,
+        'longest_run': longest_run,
+        'lis_estimate': len(kept),
+        'out_of_place': len(removed),
+    }
+
+
+def _inversions_array(values):
+    """
+    Inversion count of a numeric array, level by level of a bottom-up merge
+    sort. Values are replaced by their stable ranks, so equal values never
+    count, and each level counts for every element of a right half the
+    left half elements above it with one vectorized binary search.
+    """
+    n = len(values)
+    ranks = np.empty(n, dtype=np.int64)
+    ranks[np.argsort(values, kind='stable')] = np.arange(n)
+    positions = np.arange(n)
+
+    total = 0
+    width = 1
+    while width < n:
+        block = positions // (2 * width)
+        right = (positions // width) % 2 == 1
+
+        # Block-major keys sort every left half within its own block
+        left = np.sort(block[~right] * n + ranks[~right])
+        ends = np.searchsorted(left, (block[right] + 1) * n)
+        total += int((ends - np.searchsorted(left, block[right] * n + ranks[right])).sum())
+        width *= 2
+    return total
+
+
+def _inversions_list(arr):
+    """
+    Inversion count of a list by a bottom-up merge sort that adds the number
+    of elements left in the left run whenever the right run goes first.
+    """
+    src, n = list(arr), len(arr)
+    dst = [None] * n
+    total = 0
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid, hi = min(lo + width, n), min(lo + 2 * width, n)
+            i, j, k = lo, mid, lo
+            while i < mid and j < hi:
+                if src[j] < src[i]:
+                    dst[k] = src[j]
+                    total += mid - i
+                    j += 1
+                else:
+                    dst[k] = src[i]
+                    i += 1
+                k += 1
+            dst[k:hi] = src[i:mid] if i < mid else src[j:hi]
+        src, dst = dst, src
+        width *= 2
+    return total
+
+
+def inversions(arr):
+    """
+    Exact number of pairs i < j with arr[j] < arr[i], in O(n log n).
+    Numbers are counted with vectorized NumPy code, anything else with a
+    merge sort in Python.
+    """
+    values = np.asarray(arr)
+    if values.ndim == 1 and values.dtype.kind in 'iuf':
+        return _inversions_array(values)
+    return _inversions_list(arr)
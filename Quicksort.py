@@ -1,7 +1,5 @@
-import random
-import time
-import matplotlib.pyplot as plt
-import math
+from Heapsort import heap_sort_range
+from Argsort import argsort_by
 
 def quick_sort(data):
     """
@@ -23,63 +21,185 @@ def quick_sort(data):
 
     return quick_sort(left) + middle + quick_sort(right)
 
-def measure_time(data):
+INSERTION_CUTOFF = 16  # Partitions up to this size use insertion sort
+NINTHER_CUTOFF = 40  # Partitions above this size use a ninther pivot
+
+
+def _insertion_sort(data, lo, hi):
+    """
+    Sorts data[lo:hi] in place using insertion sort.
+    """
+    for i in range(lo + 1, hi):
+        item = data[i]
+        j = i - 1
+        while j >= lo and item < data[j]:
+            data[j + 1] = data[j]
+            j -= 1
+        data[j + 1] = item
+
+def _median_of_three(data, a, b, c):
+    """
+    Returns whichever of the indices a, b, c holds the median value.
+    """
+    if data[a] < data[b]:
+        if data[b] < data[c]:
+            return b
+        return c if data[a] < data[c] else a
+    if data[a] < data[c]:
+        return a
+    return c if data[b] < data[c] else b
+
+def _choose_pivot(data, lo, hi):
+    """
+    Returns the index of the pivot for data[lo:hi]: median of three for small
+    partitions, Tukey's ninther (median of three medians) for larger ones.
+    """
+    mid = lo + (hi - lo) // 2
+    if hi - lo <= NINTHER_CUTOFF:
+        return _median_of_three(data, lo, mid, hi - 1)
+
+    step = (hi - lo) // 8
+    return _median_of_three(
+        data,
+        _median_of_three(data, lo, lo + step, lo + 2 * step),
+        _median_of_three(data, mid - step, mid, mid + step),
+        _median_of_three(data, hi - 1 - 2 * step, hi - 1 - step, hi - 1),
+    )
+
+def _partition3(data, lo, hi, pivot):
     """
-    Measures the average execution time of Quick Sort for the given data.
+    Three-way (Dutch national flag) partition of data[lo:hi] around pivot.
+
+    Returns:
+        (lt, gt) such that data[lo:lt] < pivot, data[lt:gt] == pivot and
+        data[gt:hi] > pivot.
+    """
+    lt, i, gt = lo, lo, hi
+    while i < gt:
+        x = data[i]
+        if x < pivot:
+            data[i] = data[lt]
+            data[lt] = x
+            lt += 1
+            i += 1
+        elif pivot < x:
+            gt -= 1
+            data[i] = data[gt]
+            data[gt] = x
+        else:
+            i += 1
+    return lt, gt
+
+def _introsort(data, lo, hi, depth_limit):
+    """
+    Introsort of data[lo:hi], falling back to heap sort once depth_limit
+    levels of partitioning have been used up.
+    """
+    while hi - lo > INSERTION_CUTOFF:
+        if depth_limit == 0:
+            heap_sort_range(data, lo, hi)
+            return
+        depth_limit -= 1
+
+        pivot = data[_choose_pivot(data, lo, hi)]
+        lt, gt = _partition3(data, lo, hi, pivot)
+
+        # Recurse into the smaller side and loop on the larger one, which
+        # keeps the stack O(log n) deep
+        if lt - lo < hi - gt:
+            _introsort(data, lo, lt, depth_limit)
+            lo = gt
+        else:
+            _introsort(data, gt, hi, depth_limit)
+            hi = lt
+
+    _insertion_sort(data, lo, hi)
+
+def introsort(data):
+    """
+    Sorts the given data in place using introsort: Quick Sort with ninther
+    pivots and three-way partitioning, insertion sort for small partitions,
+    and a 2 * log2(n) depth limit after which it switches to Heap Sort.
 
     Args:
-        data: The data to sort.
+        data: A list of comparable elements.
+    """
+    n = len(data)
+    if n <= 1:
+        return
+    _introsort(data, 0, n, 2 * n.bit_length())
+
+def _median_of_medians(data, lo, hi):
+    """
+    Moves the median of every group of five in data[lo:hi] to the front of
+    the range and returns the index of the median of those medians. That
+    value is guaranteed to lie between the 30th and 70th percentiles.
+    """
+    dest = lo
+    for group in range(lo, hi, 5):
+        end = min(group + 5, hi)
+        _insertion_sort(data, group, end)
+        median = (group + end - 1) // 2
+        data[dest], data[median] = data[median], data[dest]
+        dest += 1
+
+    mid = lo + (dest - lo) // 2
+    _select(data, lo, dest, mid, 0)
+    return mid
+
+def _select(data, lo, hi, k, depth_limit):
+    """
+    Introselect: partitions data[lo:hi] until data[k] holds the value it
+    would have if the range were sorted. Once depth_limit partitions have
+    been used up, pivots come from the median of medians, which bounds the
+    remaining work to O(n).
+    """
+    while hi - lo > INSERTION_CUTOFF:
+        if depth_limit > 0:
+            depth_limit -= 1
+            pivot_index = _choose_pivot(data, lo, hi)
+        else:
+            pivot_index = _median_of_medians(data, lo, hi)
+
+        lt, gt = _partition3(data, lo, hi, data[pivot_index])
+        if k < lt:
+            hi = lt
+        elif k >= gt:
+            lo = gt
+        else:
+            return
+
+    _insertion_sort(data, lo, hi)
+
+def select_nth(data, k):
+    """
+    Finds the k-th smallest element (counting from 0) without sorting.
+
+    The list is reordered in place like C++ nth_element: afterwards data[k]
+    is the k-th smallest, everything before it is no larger and everything
+    after it is no smaller.
+
+    Args:
+        data: A list of comparable elements.
+        k: The rank to select, 0 <= k < len(data).
 
     Returns:
-        The average execution time in seconds.
-    """
-    start_time = time.time()
-    quick_sort(data)
-    end_time = time.time()
-    return end_time - start_time
-
-if __name__ == "__main__":
-    # Define the range of data sizes
-    n_values = list(range(100, 1001, 100))
-
-    # Initialize lists to store execution times for each range
-    all_times = [[] for _ in range(6)]
-
-    # Measure execution time for each range and store the times
-    for n in n_values:
-        data1 = random.sample(range(n), n)
-        data2 = random.sample(range(min(1000, n)), n)
-        data3 = random.sample(range(n ** 3), n)
-        data4 = [random.randint(0, int(math.log(n))) for _ in range(n)]
-
-        data5 = [random.randint(0, n) * 1000 for _ in range(n)]
-        data6 = list(range(n))
-        num_swaps = math.ceil(math.log(n / 2, 2))
-        for _ in range(num_swaps):
-            idx = random.randint(0, n - 1)
-            idx_swap = random.randint(0, n - 1)
-            data6[idx], data6[idx_swap] = data6[idx_swap], data6[idx]
-
-        all_data = [data1, data2, data3, data4, data5, data6]
-        for i, data in enumerate(all_data):
-            all_times[i].append(measure_time(data))
-
-    # Plot the time complexity for all ranges in one graph
-    plt.figure(figsize=(10, 6))
-    labels = [
-        '[0…n]',
-        '[0…k], k < 1000',
-        '[0…n^3]',
-        '[0…log n]',
-        'Multiples of 1000 in [0…n]',
-        'In-order with Logarithmic Swaps'
-    ]
-    for i, times in enumerate(all_times):
-        plt.plot(n_values, times, label=labels[i])
-
-    plt.xlabel('Data size (n)')
-    plt.ylabel('Average execution time (s)')
-    plt.title('Quick Sort Time Complexity for Various Ranges')
-    plt.grid(True)
-    plt.legend()
-    plt.show()
+        The k-th smallest element.
+    """
+    n = len(data)
+    if not 0 <= k < n:
+        raise IndexError("select_nth rank out of range")
+    _select(data, 0, n, k, 2 * n.bit_length())
+    return data[k]
+
+def quick_sort_argsort(keys):
+    """
+    Returns the stable permutation that sorts keys, found with quick_sort.
+    """
+    return argsort_by(quick_sort, keys, in_place=False)
+
+def introsort_argsort(keys):
+    """
+    Returns the stable permutation that sorts keys, found with introsort.
+    """
+    return argsort_by(introsort, keys)
@@ -1,7 +1,4 @@
-import random
-import time
-import matplotlib.pyplot as plt
-import math
+import numpy as np
 
 def counting_sort(arr, exp):
     """
@@ -32,72 +29,538 @@ def counting_sort(arr, exp):
     for i in range(len(arr)):
         arr[i] = output[i]
 
+RADIX_BITS = 8  # Digit width of the LSD engine, i.e. base 256
+
+
+def ordered_keys(values):
+    """
+    Map an integer or float ndarray to unsigned keys of the same width that
+    sort in the same order.
+
+    Signed integers get their sign bit flipped. Floats are mapped by their
+    IEEE-754 bits: positive values get the sign bit set and negative values
+    have every bit inverted. That puts -inf first, -0.0 just before +0.0 and
+    +inf last; every NaN is first made the same positive quiet NaN, so NaNs
+    always end up after +inf.
+    """
+    if values.dtype.kind not in 'iuf' or values.dtype.itemsize > 8:
+        raise TypeError("radix sort needs an integer or float array, got %s" % values.dtype)
+
+    key_type = np.dtype('u%d' % values.dtype.itemsize)
+    width = 8 * values.dtype.itemsize
+    sign_bit = key_type.type(1 << (width - 1))
+
+    if values.dtype.kind == 'u':
+        return values.astype(key_type, copy=False)
+    if values.dtype.kind == 'i':
+        return values.view(key_type) ^ sign_bit
+
+    nans = np.isnan(values)
+    if nans.any():
+        values = np.where(nans, values.dtype.type(np.nan), values)
+    bits = values.view(key_type)
+    negative = bits >> key_type.type(width - 1)
+    return bits ^ (negative * np.iinfo(key_type).max | sign_bit)
+
+
+def from_ordered_keys(keys, dtype):
+    """
+    Inverse of ordered_keys.
+    """
+    if dtype.kind == 'u':
+        return keys.astype(dtype, copy=False)
+
+    width = 8 * dtype.itemsize
+    sign_bit = keys.dtype.type(1 << (width - 1))
+    if dtype.kind == 'i':
+        return (keys ^ sign_bit).view(dtype)
+
+    negative = keys.dtype.type(1) - (keys >> keys.dtype.type(width - 1))
+    return (keys ^ (negative * np.iinfo(keys.dtype).max | sign_bit)).view(dtype)
+
+
+def _lsd_sort(keys, radix_bits=RADIX_BITS, order=None):
+    """
+    Stable LSD radix passes over an array of unsigned keys.
+
+    Passes whose digit is the same for every key are skipped. If order is
+    given it is permuted alongside the keys, so the result doubles as a
+    stable argsort.
+
+    Returns:
+        The sorted keys and the permuted order (None if none was given).
+    """
+    if not 1 <= radix_bits <= 16:
+        raise ValueError("radix_bits must be between 1 and 16")
+    if len(keys) <= 1:
+        return keys, order
+
+    mask = (1 << radix_bits) - 1
+    digit_type = np.uint8 if radix_bits <= 8 else np.uint16
+
+    # Any bit that never differs from the first key is constant everywhere
+    varying = int(np.bitwise_or.reduce(keys ^ keys[0]))
+
+    for shift in range(0, keys.dtype.itemsize * 8, radix_bits):
+        if not (varying >> shift) & mask:
+            continue  # Every key has the same digit, the pass is a no-op
+
+        digit = ((keys >> shift) & mask).astype(digit_type)
+
+        # Stable argsort of a uint8/uint16 digit is NumPy's counting sort:
+        # one histogram, prefix-summed offsets and a scatter, all in C
+        perm = np.argsort(digit, kind='stable')
+        keys = keys[perm]
+        if order is not None:
+            order = order[perm]
+
+    return keys, order
+
+
+COUNTING_MAX_RANGE = 1 << 20  # Largest value range given a counting array
+
+
+def _small_range(n, lo, hi):
+    """
+    True if n integers in [lo, hi] are cheaper to sort with one counting
+    pass than with radix passes.
+    """
+    span = hi - lo + 1
+    return span <= COUNTING_MAX_RANGE and span <= max(n, 256)
+
+
+def _counting_sort_array(values, lo, hi):
+    """
+    Counting sort of an integer array whose values all lie in [lo, hi]:
+    one bincount, then every value repeated as often as it was counted.
+    """
+    # Offsets in a wide type, so int8/int16 values cannot wrap around; they
+    # lie in [0, hi - lo], so the unsigned ones can be read as intp as is
+    offsets = values.astype(np.uint64 if values.dtype.kind == 'u' else np.int64)
+    offsets -= offsets.dtype.type(lo)
+    counts = np.bincount(offsets.view(np.intp), minlength=hi - lo + 1)
+    return np.repeat(np.arange(lo, hi + 1, dtype=values.dtype), counts)
+
+
+def _checked_range(values, lo, hi):
+    """
+    Fills in a missing lo or hi from the data and checks that every value
+    lies within [lo, hi].
+    """
+    if values.dtype.kind not in 'iu':
+        raise TypeError("counting sort needs integers, got %s" % values.dtype)
+    if not len(values):
+        return 0, -1
+    data_lo, data_hi = values.min().item(), values.max().item()
+    lo = data_lo if lo is None else lo
+    hi = data_hi if hi is None else hi
+    if data_lo < lo or data_hi > hi:
+        raise ValueError("values fall outside [%d, %d]" % (lo, hi))
+    return lo, hi
+
+
+def counting_sort_range(arr, lo=None, hi=None):
+    """
+    Sort integers from a small range [lo, hi] with a single counting pass,
+    in O(n + hi - lo) time.
+
+    Args:
+        arr: A list or NumPy array of integers.
+        lo, hi: Bounds of the values, taken from the data when omitted. If
+            both are omitted and the range turns out to be too wide for
+            counting, the radix engine is used instead.
+
+    Returns:
+        A new sorted list, or a NumPy array of the same dtype if arr is one.
+    """
+    if not len(arr):
+        return arr.copy() if isinstance(arr, np.ndarray) else []
+
+    values = np.asarray(arr)
+    auto = lo is None and hi is None
+    lo, hi = _checked_range(values, lo, hi)
+
+    if auto and not _small_range(len(values), lo, hi):
+        result = radix_sort_array(values)
+    else:
+        result = _counting_sort_array(values, lo, hi)
+
+    if isinstance(arr, np.ndarray):
+        return result
+    return result.tolist()
+
+
+def counting_sort_range_stable(arr, lo=None, hi=None):
+    """
+    Stable counting sort of integers from [lo, hi] that also returns the
+    permutation. The keys value - lo are scattered by the LSD engine, which
+    for a range of up to 256 values is exactly one counting pass.
+
+    Returns:
+        The sorted values (a list, or a NumPy array if arr is one) and an
+        int32/int64 index array such that arr taken in that order is sorted.
+    """
+    if not len(arr):
+        empty = arr.copy() if isinstance(arr, np.ndarray) else []
+        return empty, np.arange(0, dtype=np.int32)
+
+    values = np.ascontiguousarray(arr)
+    lo, hi = _checked_range(values, lo, hi)
+
+    n = len(values)
+    order = np.arange(n, dtype=np.int32 if n < 2 ** 31 else np.int64)
+    keys = (values.astype(np.int64) - lo).astype(np.uint64)
+    _, order = _lsd_sort(keys, RADIX_BITS, order)
+
+    result = values[order]
+    if not isinstance(arr, np.ndarray):
+        result = result.tolist()
+    return result, order
+
+
+def radix_sort_array(values, radix_bits=RADIX_BITS):
+    """
+    Sort an integer or float ndarray with the byte-wise LSD engine. Floats
+    sort like np.sort: -0.0 before +0.0 and NaNs last. Integers from a
+    small range are counted in one pass instead.
+
+    Args:
+        values: A NumPy array of integers or of float16/32/64.
+        radix_bits: Bits per digit (8 means base 256).
+
+    Returns:
+        A new sorted array with the same dtype as values.
+    """
+    values = np.ascontiguousarray(values)
+    if values.dtype.kind in 'iu' and len(values):
+        lo, hi = values.min().item(), values.max().item()
+        if _small_range(len(values), lo, hi):
+            return _counting_sort_array(values, lo, hi)
+
+    keys, _ = _lsd_sort(ordered_keys(values), radix_bits)
+    return from_ordered_keys(keys, values.dtype)
+
+
+FLOAT_EXACT_INT = 2 ** 53  # Ints up to this magnitude are exactly representable as float64
+
+
+def exact_as_floats(items):
+    """
+    True if no int among items loses precision as a float64. NumPy infers
+    float64 for a list holding an int of 2**63 or more, or ints mixed with
+    floats, and large ints are then rounded.
+    """
+    return not any(isinstance(x, int) and abs(x) > FLOAT_EXACT_INT for x in items)
+
+
+def _radix_sort_base10(arr):
+    """
+    Base-10 radix sort of a list of Python ints of any size. Negative numbers
+    are sorted by magnitude separately and put in front.
+    """
+    negatives = [-x for x in arr if x < 0]
+    non_negatives = [x for x in arr if x >= 0]
+
+    for part in (negatives, non_negatives):
+        if not part:
+            continue
+        max_element = max(part)
+        exp = 1
+        while max_element // exp > 0:
+            counting_sort(part, exp)
+            exp *= 10
+
+    arr[:] = [-x for x in reversed(negatives)] + non_negatives
+
+
 def radix_sort(arr):
     """
     Perform Radix Sort on the given array.
+
+    NumPy integer and float arrays are sorted in place without creating
+    Python objects. Lists of ints that fit in 64 bits or of floats go
+    through the same engine, other ints fall back to base-10 counting_sort
+    passes. Floats mixed with ints beyond 2**53 are compared as objects.
     """
-    max_element = max(arr)
-    exp = 1
-    while max_element // exp > 0:
-        counting_sort(arr, exp)
-        exp *= 10
+    if len(arr) <= 1:
+        return
+
+    if isinstance(arr, np.ndarray):
+        arr[...] = radix_sort_array(arr)
+        return
+
+    values = np.asarray(arr)
+    if values.dtype.kind == 'f' and exact_as_floats(arr):
+        # Reorder the original objects, so ints mixed in with floats stay ints
+        arr[:] = [arr[i] for i in radix_argsort(values).tolist()]
+    elif values.dtype.kind in 'iu':
+        arr[:] = radix_sort_array(values).tolist()
+    elif all(isinstance(x, int) for x in arr):
+        _radix_sort_base10(arr)
+    else:
+        # Floats mixed with ints too large for a float64 only compare
+        # exactly as Python objects
+        arr.sort()
+
 
-def measure_time(data):
+def radix_argsort(keys, radix_bits=RADIX_BITS):
     """
-    Measure the average execution time of Radix Sort for the given data.
+    Stable argsort of integer or float keys with the byte-wise LSD engine.
+    Lists that do not fit a fixed-width array exactly are argsorted as
+    Python objects.
 
     Args:
-        data: The data to sort.
+        keys: A list or NumPy array of fixed-width numbers.
+        radix_bits: Bits per digit (8 means base 256).
 
     Returns:
-        The average execution time in seconds.
-    """
-    start_time = time.time()
-    radix_sort(data)
-    end_time = time.time()
-    return end_time - start_time
-
-if __name__ == "__main__":
-    # Define the range of data sizes
-    n_values = list(range(100, 1001, 100))
-
-    # Initialize lists to store execution times for each range
-    all_times = [[] for _ in range(6)]
-
-    # Measure execution time for each range and store the times
-    for n in n_values:
-        data1 = random.sample(range(n), n)
-        data2 = random.sample(range(min(1000, n)), n)
-        data3 = random.sample(range(n ** 3), n)
-        data4 = [random.randint(0, int(math.log(n))) for _ in range(n)]
-        data5 = [random.randint(0, n) * 1000 for _ in range(n)]
-        data6 = list(range(n))
-        num_swaps = math.ceil(math.log(n / 2, 2))
-        for _ in range(num_swaps):
-            idx = random.randint(0, n - 1)
-            idx_swap = random.randint(0, n - 1)
-            data6[idx], data6[idx_swap] = data6[idx_swap], data6[idx]
-
-        all_data = [data1, data2, data3, data4, data5, data6]
-        for i, data in enumerate(all_data):
-            all_times[i].append(measure_time(data))
-
-    # Plot the time complexity for all ranges in one graph
-    plt.figure(figsize=(10, 6))
-    labels = [
-        '[0…n]',
-        '[0…k], k < 1000',
-        '[0…n^3]',
-        '[0…log n]',
-        'Multiples of 1000 in [0…n]',
-        'In-order with Logarithmic Swaps'
-    ]
-    for i, times in enumerate(all_times):
-        plt.plot(n_values, times, label=labels[i])
-
-    plt.xlabel('Data size (n)')
-    plt.ylabel('Average execution time (s)')
-    plt.title('Radix Sort Time Complexity for Various Ranges')
-    plt.grid(True)
-    plt.legend()
-    plt.show()
+        An int32 index array (int64 from 2**31 keys on) that sorts keys.
+    """
+    values = np.ascontiguousarray(keys)
+    n = len(values)
+    index_type = np.int32 if n < 2 ** 31 else np.int64
+    if not isinstance(keys, np.ndarray) and (values.dtype.kind not in 'iuf' or not exact_as_floats(keys)):
+        # Ints beyond 64 bits, or rounded to float64, only compare exactly
+        # as Python objects
+        return np.array(sorted(range(n), key=keys.__getitem__), dtype=index_type)
+
+    order = np.arange(n, dtype=index_type)
+    _, order = _lsd_sort(ordered_keys(values), radix_bits, order)
+    return order
+
+
+def _column_keys(column):
+    """
+    Unsigned radix keys for one lexsort column, least significant first.
+    Numbers give one key array. Fixed-width bytes are zero padded to a
+    multiple of 8 and read as big-endian 64-bit words, one key per word.
+    """
+    values = np.ascontiguousarray(column)
+    if values.dtype.kind != 'S':
+        return [ordered_keys(values)]
+
+    n, width = len(values), values.dtype.itemsize
+    padded = np.zeros((n, -(-width // 8) * 8), dtype=np.uint8)
+    padded[:, :width] = values.view(np.uint8).reshape(n, width)
+    words = padded.view('>u8').astype(np.uint64)
+    return [words[:, j] for j in range(words.shape[1] - 1, -1, -1)]
+
+
+def lexsort(columns, radix_bits=RADIX_BITS):
+    """
+    Stable sort of rows stored column-wise, by the first column, then the
+    second, and so on.
+
+    Runs the stable LSD radix passes column by column, from the least to the
+    most significant, each one reordering the permutation found so far.
+    Columns, or 8-byte words of bytes columns, holding a single value are
+    skipped.
+
+    Args:
+        columns: Equal-length lists or NumPy arrays of integers, floats or
+            fixed-width bytes, most significant first. Floats order as in
+            radix_sort_array, -0.0 before +0.0 and NaNs last.
+        radix_bits: Bits per digit (8 means base 256).
+
+    Returns:
+        An int32 index array (int64 from 2**31 rows on) that sorts the rows.
+    """
+    n = len(columns[0]) if columns else 0
+    order = np.arange(n, dtype=np.int32 if n < 2 ** 31 else np.int64)
+
+    for column in reversed(columns):
+        if len(column) != n:
+            raise ValueError("lexsort columns must all have the same length")
+        for keys in _column_keys(column):
+            if n and (keys == keys[0]).all():
+                continue
+            _, order = _lsd_sort(keys[order], radix_bits, order)
+
+    return order
+
+
+def _segment_ids(offsets, n):
+    """
+    Checks CSR-style offsets (0 first, n last, never decreasing) and gives
+    every element the index of the segment it belongs to.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if len(offsets) < 1 or offsets[0] != 0 or offsets[-1] != n:
+        raise ValueError("offsets must start at 0 and end at len(values)")
+    lengths = np.diff(offsets)
+    if (lengths < 0).any():
+        raise ValueError("offsets must not decrease")
+    return np.repeat(np.arange(len(lengths), dtype=np.uint64), lengths)
+
+
+def _segment_keys(values, offsets):
+    """
+    Radix keys of values together with their segment ids. When both fit in
+    64 bits they are packed into one key, segment id in the high bits and
+    key - min in the low ones.
+
+    Returns:
+        The keys, the segment ids, and the minimum key and the number of
+        low bits if the keys were packed, else None for both.
+    """
+    segments = _segment_ids(offsets, len(values))
+    keys = ordered_keys(values).astype(np.uint64)
+    if not len(keys):
+        return keys, segments, None, None
+
+    lo = keys.min()
+    value_bits = int(keys.max() - lo).bit_length()
+    if value_bits + int(segments[-1]).bit_length() > 64:
+        return keys, segments, None, None
+    return (segments << np.uint64(value_bits)) | (keys - lo), segments, lo, value_bits
+
+
+def segmented_argsort(values, offsets, radix_bits=RADIX_BITS):
+    """
+    Stable argsort of every segment values[offsets[i]:offsets[i + 1]] at
+    once, as a permutation of the whole flat buffer.
+
+    Packed keys take a single run of LSD passes. Otherwise the values are
+    sorted first and the segment ids second, as in lexsort.
+
+    Returns:
+        An int32 index array (int64 from 2**31 values on) that keeps every
+        element inside its segment.
+    """
+    values = np.ascontiguousarray(values)
+    n = len(values)
+    keys, segments, lo, _ = _segment_keys(values, offsets)
+    order = np.arange(n, dtype=np.int32 if n < 2 ** 31 else np.int64)
+
+    _, order = _lsd_sort(keys, radix_bits, order)
+    if lo is None:
+        _, order = _lsd_sort(segments[order], radix_bits, order)
+    return order
+
+
+def segmented_sort(values, offsets):
+    """
+    Sort many short arrays stored back to back in one flat buffer, without
+    a Python call per array.
+
+    Every value is packed with its segment id into one 64-bit key, so a
+    single global sort of the keys sorts all segments, and the values are
+    decoded from the low bits. Equal keys are equal values, so the sort
+    need not be stable and NumPy's own sort is used. Values too wide to be
+    packed are sorted by value first and then stably by segment id.
+
+    Args:
+        values: A list or NumPy array of fixed-width numbers holding all
+            segments one after the other.
+        offsets: Segment boundaries, segment i is values[offsets[i]:offsets[i + 1]].
+
+    Returns:
+        The flat buffer with every segment sorted (a list, or a NumPy array
+        of the same dtype if values is one), and offsets, which still apply.
+    """
+    flat = np.ascontiguousarray(values)
+    keys, segments, lo, value_bits = _segment_keys(flat, offsets)
+
+    if lo is None:
+        # Any order of equal values will do, only the segment pass is stable
+        order = np.argsort(keys)
+        _, order = _lsd_sort(segments[order], RADIX_BITS, order)
+        result = flat[order]
+    else:
+        keys.sort()
+        keys &= np.uint64((1 << value_bits) - 1)
+        keys += lo
+        key_type = np.dtype('u%d' % flat.dtype.itemsize)
+        result = from_ordered_keys(keys.astype(key_type, copy=False), flat.dtype)
+
+    if not isinstance(values, np.ndarray):
+        result = result.tolist()
+    return result, offsets
+
+
+FLAG_CUTOFF = 128  # Buckets up to this size are finished with list.sort
+
+
+def _common_prefix_length(a, b, start):
+    """
+    Length of the common prefix of a and b, given that they agree on the
+    first start bytes. Binary search over slice comparisons keeps the
+    byte-by-byte work in C.
+    """
+    lo, hi = start, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def _flag_sort(keys, lo, hi, depth):
+    """
+    American flag sort of the bytes in keys[lo:hi], all of which share their
+    first depth bytes.
+    """
+    stack = [(lo, hi, depth)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= FLAG_CUTOFF:
+            keys[lo:hi] = sorted(keys[lo:hi])
+            continue
+
+        # Skip every byte the whole bucket has in common
+        depth = _common_prefix_length(min(keys[lo:hi]), max(keys[lo:hi]), depth)
+
+        # Digit 0 is for keys that end here, byte b is digit b + 1
+        digits = [key[depth] + 1 if len(key) > depth else 0 for key in keys[lo:hi]]
+        counts = [0] * 257
+        for digit in digits:
+            counts[digit] += 1
+
+        starts = [0] * 257
+        total = lo
+        for digit in range(257):
+            starts[digit] = total
+            total += counts[digit]
+        ends = starts[1:] + [hi]
+
+        # Permute in place by following cycles: each key is dropped straight
+        # into the next free slot of its bucket
+        nexts = starts[:]
+        for digit in range(257):
+            while nexts[digit] < ends[digit]:
+                i = nexts[digit]
+                key = keys[i]
+                key_digit = digits[i - lo]
+                while key_digit != digit:
+                    j = nexts[key_digit]
+                    nexts[key_digit] += 1
+                    keys[j], key = key, keys[j]
+                    key_digit, digits[j - lo] = digits[j - lo], key_digit
+                keys[i] = key
+                nexts[digit] += 1
+
+        # Keys that ended at this depth are equal, the others go one byte deeper
+        for digit in range(1, 257):
+            if counts[digit] > 1:
+                stack.append((starts[digit], ends[digit], depth + 1))
+
+def american_flag_sort(keys):
+    """
+    Sorts a list of str or bytes keys in place with an MSD radix sort
+    (American flag sort).
+
+    Keys are distributed one byte per level into 256 buckets by an in-place
+    cycle permutation. Prefixes shared by a whole bucket are skipped in one
+    step, and small buckets are finished with list.sort. Strings are sorted
+    through their UTF-8 encoding, whose byte order is code point order.
+    """
+    if len(keys) <= 1:
+        return
+
+    if isinstance(keys[0], str):
+        data = [key.encode('utf-8', 'surrogatepass') for key in keys]
+        _flag_sort(data, 0, len(data), 0)
+        keys[:] = [key.decode('utf-8', 'surrogatepass') for key in data]
+    else:
+        _flag_sort(keys, 0, len(keys), 0)
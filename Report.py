@@ -0,0 +1,250 @@
+import json
+import argparse
+
+import numpy as np
+
+from Datasets import DISTRIBUTIONS
+
+MAX_N = 10 ** 7  # Crossovers are searched up to this size, past the measured ones if need be
+CROSSOVER_POINTS = 200  # Sizes on the log-spaced grid searched for crossovers
+FIT_TOLERANCE = 0.02  # Models fitting this close to the best count as equal, the simplest wins
+RANGE_SLOWDOWN = 1.5  # Time per element ratio over the narrowest distribution flagged as range bound
+RANGE_SENSITIVE = ('radix_sort', 'counting_sort')  # Engines expected not to depend on the value range
+
+# Candidate growth models, simplest first; k is the number of bits of the
+# largest value. n*k is only offered to RANGE_SENSITIVE engines: k is a step
+# function of n, and comparison sorts have no reason to follow it
+MODELS = {
+    'n': lambda n, k: n,
+    'n log n': lambda n, k: n * np.log2(n),
+    'n*k': lambda n, k: n * k,
+    'n^2': lambda n, k: n * n,
+}
+
+# Model each algorithm should fit; anything growing faster is flagged
+EXPECTED = {
+    'radix_sort': 'n*k',
+    'counting_sort': 'n',
+    'bucket_sort': 'n',
+}
+DEFAULT_EXPECTED = 'n log n'
+
+# Growth order of the models, n*k counting as n log n since k grows with log n
+GROWTH = {'n': 0, 'n log n': 1, 'n*k': 1, 'n^2': 2}
+
+
+def key_bits(distribution, n):
+    """
+    Bits of the largest value the distribution gives at size n, or None for
+    distributions without a numeric range.
+    """
+    high = DISTRIBUTIONS[distribution].high if distribution in DISTRIBUTIONS else None
+    if high is None:
+        return None
+    return max(1, int(high(n)).bit_length())
+
+
+def fit_model(sizes, times, model, bits=None):
+    """
+    Least-squares fit of times = c * model(n). The residuals are taken
+    relative to the measured times, so every size weighs the same instead of
+    the largest dominating.
+
+    Returns:
+        The constant c and the root mean square relative error.
+    """
+    n = np.asarray(sizes, dtype=float)
+    t = np.asarray(times, dtype=float)
+    f = MODELS[model](n, np.asarray(bits, dtype=float) if bits is not None else None) / t
+    c = float(f.sum() / (f * f).sum())
+    return c, float(np.sqrt(np.mean((c * f - 1) ** 2)))
+
+
+def fit_cell(records):
+    """
+    Fits every candidate model to the median times of one (algorithm,
+    distribution) pair.
+
+    Returns:
+        A dict with the algorithm, distribution, measured sizes and times,
+        every model's constant and error, and the best model: the simplest
+        one within FIT_TOLERANCE of the smallest error.
+    """
+    records = sorted(records, key=lambda r: r['n'])
+    algorithm, distribution = records[0]['algorithm'], records[0]['distribution']
+    sizes = [r['n'] for r in records]
+    times = [r['median_ns'] / 1e9 for r in records]
+    bits = [key_bits(distribution, n) for n in sizes]
+
+    fits = {}
+    for model in MODELS:
+        if model == 'n*k' and (algorithm not in RANGE_SENSITIVE or None in bits):
+            continue
+        constant, error = fit_model(sizes, times, model, bits if model == 'n*k' else None)
+        fits[model] = {'constant': constant, 'error': error}
+
+    # k often grows like log n, and n*k then fits as well as n log n
+    least = min(fit['error'] for fit in fits.values())
+    best = next(model for model in fits if fits[model]['error'] <= least + FIT_TOLERANCE)
+
+    return {
+        'algorithm': algorithm,
+        'distribution': distribution,
+        'sizes': sizes,
+        'times': times,
+        'fits': fits,
+        'best': best,
+    }
+
+
+def predict(fit, n):
+    """
+    Time in seconds the best model of a fit_cell result predicts at size n.
+    """
+    model = fit['best']
+    bits = key_bits(fit['distribution'], n) if model == 'n*k' else None
+    return fit['fits'][model]['constant'] * MODELS[model](n, bits)
+
+
+def crossovers(fits, max_n=MAX_N):
+    """
+    Sizes at which one algorithm overtakes another on the same distribution,
+    found on the best fitting models over a log-spaced grid from the
+    smallest measured size to max_n. Near ties can flip the order back and
+    forth; each pair then gets one crossover, at the last flip, after which
+    the order holds up to max_n.
+
+    Returns:
+        A list of dicts with the distribution, the algorithm that is faster
+        from n on, the one it overtakes, n, whether n lies past the largest
+        measured size, and how many times the order flipped in total.
+    """
+    found = []
+    for a in fits:
+        for b in fits:
+            if a['distribution'] != b['distribution'] or a['algorithm'] >= b['algorithm']:
+                continue
+            lo = max(min(a['sizes']), min(b['sizes']))
+            measured = min(max(a['sizes']), max(b['sizes']))
+            grid = np.unique(np.geomspace(lo, max(lo, max_n), CROSSOVER_POINTS).astype(np.int64))
+
+            previous = None
+            flips = []
+            for n in grid.tolist():
+                faster = a['algorithm'] if predict(a, n) < predict(b, n) else b['algorithm']
+                if previous is not None and faster != previous:
+                    flips.append((n, faster, previous))
+                previous = faster
+
+            if flips:
+                n, faster, overtaken = flips[-1]
+                found.append({
+                    'distribution': a['distribution'],
+                    'faster': faster,
+                    'overtakes': overtaken,
+                    'n': n,
+                    'extrapolated': n > measured,
+                    'flips': len(flips),
+                })
+    return found
+
+
+def flags(fits):
+    """
+    Unexpected scaling: algorithms whose best model grows faster than the
+    one expected of them, e.g. quick_sort going quadratic, and range
+    sensitive engines that run markedly slower per element on wide value
+    ranges than on the narrowest one at the same size.
+
+    Returns:
+        A list of messages.
+    """
+    messages = []
+    for fit in fits:
+        expected = EXPECTED.get(fit['algorithm'], DEFAULT_EXPECTED)
+        if GROWTH[fit['best']] > GROWTH[expected]:
+            messages.append('%s on %s grows like %s, expected %s' % (
+                fit['algorithm'], fit['distribution'], fit['best'], expected))
+
+    for algorithm in RANGE_SENSITIVE:
+        cells = [fit for fit in fits if fit['algorithm'] == algorithm and key_bits(fit['distribution'], 2) is not None]
+        for n in sorted({n for fit in cells for n in fit['sizes']}):
+            per_element = {
+                fit['distribution']: fit['times'][fit['sizes'].index(n)] / n
+                for fit in cells if n in fit['sizes']
+            }
+            if len(per_element) < 2:
+                continue
+            narrowest = min(per_element, key=lambda d: key_bits(d, n))
+            for distribution, cost in per_element.items():
+                ratio = cost / per_element[narrowest]
+                if ratio > RANGE_SLOWDOWN and key_bits(distribution, n) > key_bits(narrowest, n):
+                    messages.append('%s on %s is %.1fx slower per element than on %s at n=%d (%d vs %d key bits)' % (
+                        algorithm, distribution, ratio, narrowest, n,
+                        key_bits(distribution, n), key_bits(narrowest, n)))
+    return messages
+
+
+def build_report(records, max_n=MAX_N):
+    """
+    Fits, crossovers and flags for a list of benchmark records.
+    """
+    cells = {}
+    for record in records:
+        cells.setdefault((record['algorithm'], record['distribution']), []).append(record)
+    fits = [fit_cell(cell) for cell in cells.values() if len({r['n'] for r in cell}) >= 2]
+    return {'fits': fits, 'crossovers': crossovers(fits, max_n), 'flags': flags(fits)}
+
+
+def format_report(report):
+    """
+    The report as plain text.
+    """
+    lines = ['%-22s %-16s %-8s %12s %8s' % ('algorithm', 'distribution', 'model', 'constant', 'error')]
+    for fit in report['fits']:
+        best = fit['fits'][fit['best']]
+        lines.append('%-22s %-16s %-8s %12.4g %7.1f%%' % (
+            fit['algorithm'], fit['distribution'], fit['best'], best['constant'], 100 * best['error']))
+
+    if report['crossovers']:
+        lines.append('')
+        lines.append('Crossovers:')
+        for c in report['crossovers']:
+            lines.append('  %s: %s overtakes %s from n=%d%s%s' % (
+                c['distribution'], c['faster'], c['overtakes'], c['n'],
+                ' (extrapolated)' if c['extrapolated'] else '',
+                ' (after %d flips)' % c['flips'] if c['flips'] > 1 else ''))
+
+    if report['flags']:
+        lines.append('')
+        lines.append('Flags:')
+        lines.extend('  ' + message for message in report['flags'])
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Returns:
+        The report.
+    """
+    parser = argparse.ArgumentParser(description='Fit complexity models to benchmark results.')
+    parser.add_argument('results', help='JSON file written by Benchmark.py --json')
+    parser.add_argument('--max-n', type=lambda v: int(float(v)), default=MAX_N,
+                        help='largest size searched for crossovers')
+    parser.add_argument('--json', help='write the report to this JSON file')
+    args = parser.parse_args(argv)
+
+    with open(args.results) as f:
+        report = build_report(json.load(f), args.max_n)
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
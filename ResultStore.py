@@ -0,0 +1,241 @@
+import os
+import sys
+import json
+import math
+import argparse
+import platform
+import datetime
+import subprocess
+
+import numpy as np
+
+STORE_PATH = 'benchmark_results.jsonl'  # Default result store, one run per line
+ALPHA = 0.05  # Significance level of the one-sided Mann-Whitney test
+MIN_CHANGE = 0.05  # Relative change of the median below which a cell counts as unchanged
+BOOTSTRAP_RESAMPLES = 2000  # Resamples behind every confidence interval
+CONFIDENCE = 0.95  # Coverage of the confidence intervals
+
+
+def _git_commit():
+    """
+    The checked out commit of the repository, or None outside of git.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata():
+    """
+    Describes the machine, interpreter and code a run was measured on.
+    """
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'host': platform.node(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'commit': _git_commit(),
+    }
+
+
+def save_run(records, name=None, path=STORE_PATH):
+    """
+    Appends a run, its benchmark records and metadata(), to the JSON lines
+    store at path.
+
+    Args:
+        records: Result records from Benchmark.run_benchmark.
+        name: Name to find the run by, e.g. 'baseline'. Defaults to the
+            run's timestamp.
+        path: The store file, created if missing.
+
+    Returns:
+        The stored run.
+    """
+    meta = metadata()
+    run = {'name': name or meta['timestamp'], 'metadata': meta, 'records': records}
+    with open(path, 'a') as f:
+        f.write(json.dumps(run) + '\n')
+    return run
+
+
+def load_runs(path=STORE_PATH):
+    """
+    Every run in the store, oldest first.
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_run(runs, name):
+    """
+    The latest run with the given name; 'latest' is the last run stored.
+    """
+    if name == 'latest' and runs:
+        return runs[-1]
+    for run in reversed(runs):
+        if run['name'] == name:
+            return run
+    raise KeyError("no run named %r in the store" % name)
+
+
+def _normal_sf(z):
+    """
+    Probability that a standard normal variable exceeds z.
+    """
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def mann_whitney_u(baseline, current):
+    """
+    One-sided Mann-Whitney U test of whether current tends to take longer
+    than baseline, with the normal approximation corrected for ties and for
+    continuity.
+
+    Returns:
+        U of current over baseline and the p-value.
+    """
+    m, n = len(current), len(baseline)
+    values = np.concatenate([current, baseline]).astype(float)
+
+    # Ranks, with tied values sharing the average of their ranks
+    order = np.argsort(values, kind='stable')
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(1, len(values) + 1)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ranks = (np.bincount(inverse, weights=ranks) / counts)[inverse]
+
+    u = float(ranks[:m].sum() - m * (m + 1) / 2)
+    total = m + n
+    tie_term = float((counts ** 3 - counts).sum()) / (total * (total - 1))
+    variance = m * n / 12 * (total + 1 - tie_term)
+    if variance <= 0:
+        return u, 1.0
+    z = (u - m * n / 2 - 0.5) / math.sqrt(variance)
+    return u, _normal_sf(z)
+
+
+def bootstrap_ci(baseline, current, resamples=BOOTSTRAP_RESAMPLES, confidence=CONFIDENCE, seed=0):
+    """
+    Percentile bootstrap confidence interval of the relative change of the
+    median time, median(current) / median(baseline) - 1.
+
+    Returns:
+        The lower and upper bound.
+    """
+    rng = np.random.default_rng(seed)
+    baseline, current = np.asarray(baseline, dtype=float), np.asarray(current, dtype=float)
+    base = np.median(rng.choice(baseline, size=(resamples, len(baseline))), axis=1)
+    cur = np.median(rng.choice(current, size=(resamples, len(current))), axis=1)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(cur / base - 1, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def compare(baseline, current, alpha=ALPHA, min_change=MIN_CHANGE):
+    """
+    Compares the cells two runs have in common.
+
+    A cell is 'slower' if the Mann-Whitney test finds the current times
+    larger at level alpha and the median grew by more than min_change,
+    'faster' for the mirror case, and 'same' otherwise.
+
+    Returns:
+        One dict per cell with its key, both medians, the relative change
+        with its confidence interval, both p-values and the verdict.
+    """
+    def cells(run):
+        return {(r['algorithm'], r['distribution'], r['n']): r['times_ns'] for r in run['records']}
+
+    before, after = cells(baseline), cells(current)
+    rows = []
+    for key in sorted(before.keys() & after.keys(), key=str):
+        base, cur = before[key], after[key]
+        change = float(np.median(cur) / np.median(base) - 1)
+        _, p_slower = mann_whitney_u(base, cur)
+        _, p_faster = mann_whitney_u(cur, base)
+        if p_slower < alpha and change > min_change:
+            verdict = 'slower'
+        elif p_faster < alpha and change < -min_change:
+            verdict = 'faster'
+        else:
+            verdict = 'same'
+        low, high = bootstrap_ci(base, cur)
+        rows.append({
+            'algorithm': key[0],
+            'distribution': key[1],
+            'n': key[2],
+            'baseline_median_ns': float(np.median(base)),
+            'current_median_ns': float(np.median(cur)),
+            'change': change,
+            'ci_low': low,
+            'ci_high': high,
+            'p_slower': p_slower,
+            'p_faster': p_faster,
+            'verdict': verdict,
+        })
+    return rows
+
+
+def format_comparison(rows):
+    """
+    The comparison as a plain text table.
+    """
+    lines = ['%-24s %-16s %9s %12s %12s %8s %19s %8s  %s' % (
+        'algorithm', 'distribution', 'n', 'baseline ms', 'current ms', 'change', 'CI', 'p', 'verdict')]
+    for row in rows:
+        p = row['p_slower'] if row['change'] >= 0 else row['p_faster']
+        lines.append('%-24s %-16s %9d %12.3f %12.3f %+7.1f%% [%+7.1f%%, %+7.1f%%] %8.4f  %s' % (
+            row['algorithm'], row['distribution'], row['n'],
+            row['baseline_median_ns'] / 1e6, row['current_median_ns'] / 1e6,
+            100 * row['change'], 100 * row['ci_low'], 100 * row['ci_high'], p, row['verdict']))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Returns:
+        The exit status: 1 if compare found a significant slowdown, else 0.
+    """
+    parser = argparse.ArgumentParser(description='Inspect and compare stored benchmark runs.')
+    parser.add_argument('--store', default=STORE_PATH, help='result store, default %s' % STORE_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help='list the stored runs')
+
+    compare_parser = commands.add_parser('compare', help='compare a run against a baseline')
+    compare_parser.add_argument('baseline', help='name of the baseline run')
+    compare_parser.add_argument('current', nargs='?', default='latest', help='name of the run to check, default latest')
+    compare_parser.add_argument('--alpha', type=float, default=ALPHA, help='significance level')
+    compare_parser.add_argument('--min-change', type=float, default=MIN_CHANGE,
+                                help='smallest relative change of the median that counts')
+    args = parser.parse_args(argv)
+
+    runs = load_runs(args.store)
+    if args.command == 'list':
+        for run in runs:
+            meta = run['metadata']
+            print('%-28s %s  %s  Python %s  %d cells' % (
+                run['name'], meta['timestamp'], meta['host'], meta['python'], len(run['records'])))
+        return 0
+
+    rows = compare(find_run(runs, args.baseline), find_run(runs, args.current), args.alpha, args.min_change)
+    print(format_comparison(rows))
+    slower = [row for row in rows if row['verdict'] == 'slower']
+    if slower:
+        print('\n%d of %d cells got significantly slower' % (len(slower), len(rows)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
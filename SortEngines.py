@@ -0,0 +1,110 @@
+from collections import namedtuple
+
+import numpy as np
+
+from Bucketsort import bucket_argsort, bucket_sort
+from Heapsort import heap_sort, heap_sort_argsort
+from Mergesort import merge_sort, merge_sort_argsort, merge_sort_bottom_up, merge_sort_bottom_up_argsort
+from Quicksort import introsort, introsort_argsort, quick_sort, quick_sort_argsort
+from Radixsort import counting_sort_range, counting_sort_range_stable, exact_as_floats, radix_argsort, radix_sort
+from TimSort import timsort, timsort_argsort
+
+# in_place: the engine sorts its argument instead of returning a new list
+# ndarray: the engine can be given a NumPy array directly
+# argsort: the engine's variant returning the sorting permutation
+Engine = namedtuple('Engine', ['sort', 'in_place', 'ndarray', 'argsort'])
+
+ENGINES = {
+    'merge_sort': Engine(merge_sort, True, False, merge_sort_argsort),
+    'merge_sort_bottom_up': Engine(merge_sort_bottom_up, True, False, merge_sort_bottom_up_argsort),
+    'quick_sort': Engine(quick_sort, False, False, quick_sort_argsort),
+    'introsort': Engine(introsort, True, False, introsort_argsort),
+    'heap_sort': Engine(heap_sort, True, False, heap_sort_argsort),
+    'radix_sort': Engine(radix_sort, True, True, radix_argsort),
+    'counting_sort': Engine(counting_sort_range, False, True, lambda keys: counting_sort_range_stable(keys)[1]),
+    'bucket_sort': Engine(bucket_sort, False, True, bucket_argsort),
+    'timsort': Engine(timsort, True, False, timsort_argsort),
+}
+
+
+def key_array(data, key=None):
+    """
+    Evaluates key once per item of data. Numeric keys are packed into a
+    NumPy array, which the radix and counting engines take as is, unless
+    that would round ints too large for a float64.
+
+    Returns:
+        The keys as a NumPy array if they are numbers, else as a list.
+    """
+    keys = data if key is None else [key(item) for item in data]
+    if isinstance(keys, np.ndarray):
+        return keys
+    values = np.asarray(keys)
+    if values.ndim == 1 and values.dtype.kind in 'iu':
+        return values
+    if values.ndim == 1 and values.dtype.kind == 'f' and exact_as_floats(keys):
+        return values
+    return list(keys)
+
+
+def sort_with(name, data, key=None, reverse=False):
+    """
+    Sorts data with the named engine.
+
+    With a key or reverse the engine sorts the keys, each computed once,
+    and the items are then put in that order (decorate-sort-undecorate).
+    The result is stable either way, reverse included.
+
+    Args:
+        name: A key of ENGINES.
+        data: The data to sort. In-place engines sort it directly.
+        key: Function computing the sort key of an item.
+        reverse: Sort from largest to smallest key.
+
+    Returns:
+        The sorted data.
+    """
+    engine = ENGINES[name]
+    if key is not None or reverse:
+        order = argsort(name, key_array(data, key), reverse)
+        if isinstance(data, np.ndarray):
+            result = data[order]
+        else:
+            result = [data[i] for i in order.tolist()]
+        if engine.in_place:
+            data[:] = result
+            return data
+        return result
+
+    if engine.in_place:
+        engine.sort(data)
+        return data
+    return engine.sort(data)
+
+
+def argsort(name, keys, reverse=False):
+    """
+    Returns the permutation that sorts keys, found with the named engine.
+    Applying it to other columns is a single np.take(column, perm).
+
+    If reverse is true the permutation sorts from largest to smallest and
+    is still stable: the reversed keys are sorted, so ties come out last
+    first, and reversing that result puts them back in input order.
+    """
+    sort_order = ENGINES[name].argsort
+    if not reverse:
+        return sort_order(keys)
+    return (len(keys) - 1 - sort_order(keys[::-1]))[::-1]
+
+
+def sort_array(name, values):
+    """
+    Sorts a NumPy array with the named engine, going through a Python list
+    for engines that only work on lists.
+
+    Returns:
+        A sorted NumPy array with the same dtype as values.
+    """
+    if ENGINES[name].ndarray:
+        return np.asarray(sort_with(name, values.copy()), dtype=values.dtype)
+    return np.array(sort_with(name, values.tolist()), dtype=values.dtype)
@@ -1,7 +1,9 @@
-import random
-import time
-import matplotlib.pyplot as plt
 import math
+import numpy as np
+from bisect import bisect_left, bisect_right
+from Presortedness import split_presorted
+
+FIX_UP_FACTOR = 4  # fix_up_sort re-sorts fully beyond this many times log2(n) misplaced elements
 
 def timsort(arr):
     """
@@ -9,62 +11,56 @@ def timsort(arr):
     """
     arr.sort()
 
-def measure_time(data):
+def timsort_argsort(keys):
     """
-    Measure the average execution time of TimSort for the given data.
-
-    Args:
-        data: The data to sort.
+    Returns the stable permutation that sorts keys, found by TimSort on the
+    positions with the keys as sort key.
+    """
+    keys = list(keys)
+    n = len(keys)
+    order = sorted(range(n), key=keys.__getitem__)
+    return np.array(order, dtype=np.int32 if n < 2 ** 31 else np.int64)
 
-    Returns:
-        The average execution time in seconds.
+def fix_up_sort(arr):
     """
-    start_time = time.time()
-    timsort(data)
-    end_time = time.time()
-    return end_time - start_time
+    Sorts a mostly sorted list or NumPy array in place in O(n + k log k)
+    time, where k is the number of elements out of place.
 
-if __name__ == "__main__":
-    # Define the range of data sizes
-    n_values = list(range(100, 1001, 100))
+    One linear pass splits arr into an ascending subsequence and the k
+    elements around it. If k is at most FIX_UP_FACTOR * log2(n), those are
+    sorted and each is put back with a binary search, the kept elements
+    between them copied over in slices. Otherwise arr is sorted with TimSort.
+    Equal elements keep their order either way.
+    """
+    n = len(arr)
+    if n <= 1:
+        return
 
-    # Initialize lists to store execution times for each range
-    all_times = [[] for _ in range(6)]
+    kept, kept_index, removed, removed_index = split_presorted(arr)
+    if len(removed) > FIX_UP_FACTOR * math.log2(n):
+        arr.sort()
+        return
 
-    # Measure execution time for each range and store the times
-    for n in n_values:
-        data1 = random.sample(range(n), n)
-        data2 = random.sample(range(min(1000, n)), n)
-        data3 = random.sample(range(n ** 3), n)
-        data4 = random.sample(range(1, n + 1), n)  # Use n as the upper bound
-        data5 = [random.randint(0, n) * 1000 for _ in range(n)]
-        data6 = list(range(n))
-        num_swaps = math.ceil(math.log(n / 2, 2))
-        for _ in range(num_swaps):
-            idx = random.randint(0, n - 1)
-            idx_swap = random.randint(0, n - 1)
-            data6[idx], data6[idx_swap] = data6[idx_swap], data6[idx]
-        
-        all_data = [data1, data2, data3, data4, data5, data6]
-        for i, data in enumerate(all_data):
-            all_times[i].append(measure_time(data))
+    if isinstance(arr, np.ndarray):
+        # Equal numbers are interchangeable, one vectorized insert will do
+        removed = np.sort(removed)
+        arr[:] = np.insert(kept, np.searchsorted(kept, removed, side='right'), removed)
+        return
 
-    # Plot the time complexity for all ranges in one graph
-    plt.figure(figsize=(10, 6))
-    labels = [
-        '[0…n]',
-        '[0…k], k < 1000',
-        '[0…n^3]',
-        '[0…log n]',
-        'Multiples of 1000 in [0…n]',
-        'In-order with Logarithmic Swaps'
-    ]
-    for i, times in enumerate(all_times):
-        plt.plot(n_values, times, label=labels[i])
+    # Sort by position first, so equal values stay in input order
+    order = sorted(range(len(removed)), key=removed_index.__getitem__)
+    order.sort(key=removed.__getitem__)
 
-    plt.xlabel('Data size (n)')
-    plt.ylabel('Average execution time (s)')
-    plt.title('TimSort Time Complexity for Various Ranges')
-    plt.grid(True)
-    plt.legend()
-    plt.show()
+    result = []
+    start = 0
+    for j in order:
+        x, i = removed[j], removed_index[j]
+        lo = bisect_left(kept, x, start)
+        hi = bisect_right(kept, x, lo)
+        # Among kept elements equal to x, those from before position i go first
+        pos = bisect_left(kept_index, i, lo, hi)
+        result.extend(kept[start:pos])
+        result.append(x)
+        start = pos
+    result.extend(kept[start:])
+    arr[:] = result
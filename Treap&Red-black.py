@@ -1,5 +1,4 @@
 import time
-import matplotlib.pyplot as plt
 
 class TreeNode:
     def __init__(self, key, priority=0):
@@ -164,61 +163,62 @@ def insertNodes(treeType, nodes):
     end_time = time.time()
     return tree, (end_time - start_time)
 
-treap, treap_time = insertNodes('Treap', nodes)
-rbt, rbt_time = insertNodes('RBT', [node[0] for node in nodes])
-
-def calculate_height(root):
-    if not root:
-        return 0
-    return 1 + max(calculate_height(root.left), calculate_height(root.right))
-
-treap_height = calculate_height(treap.root)
-rbt_height = calculate_height(rbt.root)
-
-metrics = {
-    'Insertion Time (s)': [treap_time, rbt_time],
-    'Height': [treap_height, rbt_height],
-    'Nodes': [treap.nodes, rbt.nodes]
-}
-
-labels = list(metrics.keys())
-treap_metrics = [metrics[label][0] for label in labels]
-rbt_metrics = [metrics[label][1] for label in labels]
-
-x = range(len(labels))
-fig, ax = plt.subplots(figsize=(10, 6))
-ax.bar(x, treap_metrics, width=0.4, label='Treap', align='center')
-ax.bar(x, rbt_metrics, width=0.4, label='Red-Black Tree', align='edge')
-ax.set_ylabel('Values')
-ax.set_title('Treap vs Red-Black Tree Performance Comparison')
-ax.set_xticks(x)
-ax.set_xticklabels(labels, rotation=45)
-ax.legend()
-
-# Generate nodes with varying sizes
-node_sizes = [10, 50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 1000, 1200, 1400, 1600, 1800, 2000, 2200, 2400, 2600, 2800, 3000, 3200, 3400, 3600, 3800, 4000, 4200, 4400, 4600, 4800, 5000, 5200, 5400, 5600, 5800, 6000, 6200, 6400, 6600, 6800, 7000, 7200, 7400, 7600, 7800]
-
-treap_times = []
-rbt_times = []
-
-for size in node_sizes:
-    nodes_subset = nodes[:size]
-
-    treap, treap_time = insertNodes('Treap', nodes_subset)
-    rbt, rbt_time = insertNodes('RBT', [node[0] for node in nodes_subset])
-
-    treap_times.append(treap_time)
-    rbt_times.append(rbt_time)
-
-# Plotting the time graph
-plt.figure(figsize=(10, 6))
-plt.plot(node_sizes, treap_times, marker='o', label='Treap')
-plt.plot(node_sizes, rbt_times, marker='s', label='Red-Black Tree')
-plt.xlabel('Number of Nodes')
-plt.ylabel('Insertion Time (s)')
-plt.title('Insertion Time Comparison for Treap and Red-Black Tree')
-plt.legend()
-plt.grid(True)
-plt.show()
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
 
+    treap, treap_time = insertNodes('Treap', nodes)
+    rbt, rbt_time = insertNodes('RBT', [node[0] for node in nodes])
 
+    def calculate_height(root):
+        if not root:
+            return 0
+        return 1 + max(calculate_height(root.left), calculate_height(root.right))
+
+    treap_height = calculate_height(treap.root)
+    rbt_height = calculate_height(rbt.root)
+
+    metrics = {
+        'Insertion Time (s)': [treap_time, rbt_time],
+        'Height': [treap_height, rbt_height],
+        'Nodes': [treap.nodes, rbt.nodes]
+    }
+
+    labels = list(metrics.keys())
+    treap_metrics = [metrics[label][0] for label in labels]
+    rbt_metrics = [metrics[label][1] for label in labels]
+
+    x = range(len(labels))
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(x, treap_metrics, width=0.4, label='Treap', align='center')
+    ax.bar(x, rbt_metrics, width=0.4, label='Red-Black Tree', align='edge')
+    ax.set_ylabel('Values')
+    ax.set_title('Treap vs Red-Black Tree Performance Comparison')
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, rotation=45)
+    ax.legend()
+
+    # Generate nodes with varying sizes
+    node_sizes = [10, 50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 1000, 1200, 1400, 1600, 1800, 2000, 2200, 2400, 2600, 2800, 3000, 3200, 3400, 3600, 3800, 4000, 4200, 4400, 4600, 4800, 5000, 5200, 5400, 5600, 5800, 6000, 6200, 6400, 6600, 6800, 7000, 7200, 7400, 7600, 7800]
+
+    treap_times = []
+    rbt_times = []
+
+    for size in node_sizes:
+        nodes_subset = nodes[:size]
+
+        treap, treap_time = insertNodes('Treap', nodes_subset)
+        rbt, rbt_time = insertNodes('RBT', [node[0] for node in nodes_subset])
+
+        treap_times.append(treap_time)
+        rbt_times.append(rbt_time)
+
+    # Plotting the time graph
+    plt.figure(figsize=(10, 6))
+    plt.plot(node_sizes, treap_times, marker='o', label='Treap')
+    plt.plot(node_sizes, rbt_times, marker='s', label='Red-Black Tree')
+    plt.xlabel('Number of Nodes')
+    plt.ylabel('Insertion Time (s)')
+    plt.title('Insertion Time Comparison for Treap and Red-Black Tree')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
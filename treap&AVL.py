@@ -1,5 +1,4 @@
 import time
-import matplotlib.pyplot as plt
 
 class TreeNode:
     def __init__(self, key, priority=0):
@@ -130,60 +129,62 @@ def insertNodes(treeType, nodes):
     end_time = time.time()
     return tree, (end_time - start_time)
 
-avl_tree, avl_time = insertNodes('AVL', nodes)
-treap, treap_time = insertNodes('Treap', nodes)
-
-def calculate_height(root):
-    if not root:
-        return 0
-    return 1 + max(calculate_height(root.left), calculate_height(root.right))
-
-avl_height = calculate_height(avl_tree.root)
-treap_height = calculate_height(treap.root)
-
-metrics = {
-    'Insertion Time (s)': [avl_time, treap_time],
-    'Height': [avl_height, treap_height],
-    'Nodes': [avl_tree.nodes, treap.nodes]
-}
-
-labels = list(metrics.keys())
-avl_metrics = [metrics[label][0] for label in labels]
-treap_metrics = [metrics[label][1] for label in labels]
-
-x = range(len(labels))
-fig, ax = plt.subplots(figsize=(10, 6))
-ax.bar(x, avl_metrics, width=0.4, label='AVL', align='center')
-ax.bar(x, treap_metrics, width=0.4, label='Treap', align='edge')
-ax.set_ylabel('Values')
-ax.set_title('AVL Tree vs Treap Performance Comparison')
-ax.set_xticks(x)
-ax.set_xticklabels(labels, rotation=45)
-ax.legend()
-
-# Generate nodes with varying sizes
-node_sizes = [10, 50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 1000, 1200, 1400, 1600, 1800, 2000, 2200, 2400, 2600, 2800, 3000, 3200, 3400, 3600, 3800, 4000, 4200, 4400, 4600, 4800, 5000, 5200, 5400, 5600, 5800, 6000, 6200, 6400, 6600, 6800, 7000, 7200, 7400, 7600, 7800]
-
-avl_times = []
-treap_times = []
-
-for size in node_sizes:
-    nodes_subset = nodes[:size]
-
-    avl_tree, avl_time = insertNodes('AVL', nodes_subset)
-    treap, treap_time = insertNodes('Treap', nodes_subset)
-
-    avl_times.append(avl_time)
-    treap_times.append(treap_time)
-
-# Plotting the time graph
-plt.figure(figsize=(10, 6))
-plt.plot(node_sizes, avl_times, marker='o', label='AVL')
-plt.plot(node_sizes, treap_times, marker='s', label='Treap')
-plt.xlabel('Number of Nodes')
-plt.ylabel('Insertion Time (s)')
-plt.title('Insertion Time Comparison for AVL Tree and Treap')
-plt.legend()
-plt.grid(True)
-plt.show()
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
 
+    avl_tree, avl_time = insertNodes('AVL', nodes)
+    treap, treap_time = insertNodes('Treap', nodes)
+
+    def calculate_height(root):
+        if not root:
+            return 0
+        return 1 + max(calculate_height(root.left), calculate_height(root.right))
+
+    avl_height = calculate_height(avl_tree.root)
+    treap_height = calculate_height(treap.root)
+
+    metrics = {
+        'Insertion Time (s)': [avl_time, treap_time],
+        'Height': [avl_height, treap_height],
+        'Nodes': [avl_tree.nodes, treap.nodes]
+    }
+
+    labels = list(metrics.keys())
+    avl_metrics = [metrics[label][0] for label in labels]
+    treap_metrics = [metrics[label][1] for label in labels]
+
+    x = range(len(labels))
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(x, avl_metrics, width=0.4, label='AVL', align='center')
+    ax.bar(x, treap_metrics, width=0.4, label='Treap', align='edge')
+    ax.set_ylabel('Values')
+    ax.set_title('AVL Tree vs Treap Performance Comparison')
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, rotation=45)
+    ax.legend()
+
+    # Generate nodes with varying sizes
+    node_sizes = [10, 50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 1000, 1200, 1400, 1600, 1800, 2000, 2200, 2400, 2600, 2800, 3000, 3200, 3400, 3600, 3800, 4000, 4200, 4400, 4600, 4800, 5000, 5200, 5400, 5600, 5800, 6000, 6200, 6400, 6600, 6800, 7000, 7200, 7400, 7600, 7800]
+
+    avl_times = []
+    treap_times = []
+
+    for size in node_sizes:
+        nodes_subset = nodes[:size]
+
+        avl_tree, avl_time = insertNodes('AVL', nodes_subset)
+        treap, treap_time = insertNodes('Treap', nodes_subset)
+
+        avl_times.append(avl_time)
+        treap_times.append(treap_time)
+
+    # Plotting the time graph
+    plt.figure(figsize=(10, 6))
+    plt.plot(node_sizes, avl_times, marker='o', label='AVL')
+    plt.plot(node_sizes, treap_times, marker='s', label='Treap')
+    plt.xlabel('Number of Nodes')
+    plt.ylabel('Insertion Time (s)')
+    plt.title('Insertion Time Comparison for AVL Tree and Treap')
+    plt.legend()
+    plt.grid(True)
+    plt.show()